@@ -32,15 +32,70 @@ from neon_utils.skills.common_message_skill import CommonMessageSkill, CMSMatchL
 from neon_utils.user_utils import get_message_user
 from ovos_utils import classproperty
 from ovos_utils.log import LOG
+from ovos_utils.messagebus import Message
 from ovos_utils.process_utils import RuntimeRequirements
-import phonenumbers
-import re
+from collections import OrderedDict
+from os.path import join
+from threading import Lock
+from typing import List, Optional
+from uuid import uuid4
+
+from .addresses import normalize_spoken_email
+from .admission import AdmissionController
+from .classify import EMAIL, MIXED, NAME, NUMBER, classify_recipient, \
+    extract_digits
+from .contacts import Contact, ContactIndex
+from .dialogs import DialogCache
+from .dispatch import MobileDispatcher
+from .drafts import CallDraft, DraftStore, EmailDraft, ShardedDraftStore, \
+    SmsDraft, DRAFT_INPUTS, DRAFT_TRANSITIONS, TEXT, shard_index
+from .journal import DraftJournal
+from .lookups import ContactLookupTracker, PendingLookup
+from .matcher import ConfirmationClassifier, MessageMatcher
+from .metrics import Metrics, timed
+from .phone import get_cache_stats, normalize_phone
+from .phrases import ExtractionPhrases, PHRASES, PhraseIndex, read_lines
+from .recipients import RecentRecipient, RecipientIndex
+from .streaming import UtteranceParse, extract_email, extract_sms
+from .tracing import TRACER
+
+# Match confidence for recipients the user has sent to before
+RAISED_CONFIDENCE = {CMSMatchLevel.MEDIA: CMSMatchLevel.EXACT}
+
+# Dialogs spoken on most turns, rendered from a pre-parsed cache
+PROMPT_DIALOGS = ("ConfirmCall", "ConfirmMessage", "ConfirmEmail",
+                  "ConfirmSend", "GetEmailBody", "GetEmailSubject")
 
 
 class MessagingSkill(CommonMessageSkill):
     def __init__(self, **kwargs):
+        # State is created before the base class is initialized, since it may
+        # call `initialize` when `skill_id` and `bus` are passed
+        self.drafts = DraftStore()
+        self._worker_count = 1
+        self._worker_index = 0
+        self.contacts = ContactIndex()
+        self.recipients = RecipientIndex()
+        self.dispatcher = None
+        self.lookups = ContactLookupTracker(self._handle_lookup_timeout)
+        self.metrics = Metrics()
+        self.admission = None
+        self.dialog_cache = DialogCache(
+            lambda name, lang: self.find_resource(f"{name}.dialog", "dialog",
+                                                  lang))
+        self._matchers = {}
+        self._confirmations = {}
+        # user -> UtteranceParse of a partial transcript
+        self._partials = OrderedDict()
+        self._partials_lock = Lock()
+        self._max_partials = 1000
+        self.phrases = PhraseIndex(
+            lambda name, lang: read_lines(
+                self.find_resource(f"{name}.list", "locale", lang)))
+        self._transitions = {
+            key: (getattr(self, f"_draft_{action}"), next_state)
+            for key, (action, next_state) in DRAFT_TRANSITIONS.items()}
         CommonMessageSkill.__init__(self, **kwargs)
-        self.drafts = {}
 
     @classproperty
     def runtime_requirements(self):
@@ -56,17 +111,93 @@ class MessagingSkill(CommonMessageSkill):
 
     # TODO: Move to __init__ after ovos-workshop stable release
     def initialize(self):
+        max_drafts = self.settings.get("max_drafts", 1000)
+        draft_ttl = self.settings.get("draft_timeout_seconds", 900)
+        shards = self.settings.get("draft_shards", 1)
+        if shards > 1:
+            self.drafts = ShardedDraftStore(shards, max_drafts, draft_ttl)
+        else:
+            self.drafts = DraftStore(max_drafts, draft_ttl)
+        # Multiple skill workers on one bus each serve a disjoint set of users
+        self._worker_count = self.settings.get("worker_count", 1)
+        self._worker_index = self.settings.get("worker_index", 0)
+        if self.settings.get("persist_drafts", True):
+            self.drafts.journal = DraftJournal(self._journal_path("drafts"))
+            self.drafts.journal.prune(self.drafts.ttl)
+        self.contacts.ttl = self.settings.get("contact_cache_seconds", 3600)
+        if self.settings.get("persist_recipients", True):
+            self.recipients.journal = DraftJournal(
+                self._journal_path("recipients"), table="recipients")
+            self.recipients.journal.prune(
+                self.settings.get("recipient_history_days", 180) * 86400)
+        self.lookups.timeout = self.settings.get("contact_lookup_timeout", 15)
+        self.metrics.enabled = self.settings.get("enable_metrics", False)
+        TRACER.sample_rate = self.settings.get("trace_sample_rate", 0.0)
+        rate_limit = self.settings.get("rate_limit_per_minute", 30)
+        if rate_limit:
+            self.admission = AdmissionController(
+                rate_limit / 60, self.settings.get("rate_limit_burst", 10))
+        self.dialog_cache.warm(self.lang, PROMPT_DIALOGS)
+        self.dispatcher = MobileDispatcher(
+            self.bus.emit,
+            max_workers=self.settings.get("dispatch_workers", 4),
+            ack_timeout=self.settings.get("dispatch_ack_timeout", 10),
+            retries=self.settings.get("dispatch_retries", 2),
+            client_key=get_message_user)
+
         draft_email_intent = IntentBuilder("DraftEmailIntent")\
             .optionally("Neon").require("draft").require("email") \
             .optionally("message").build()
         self.register_intent(draft_email_intent, self.handle_send_email)
 
         self.add_event("neon.messaging.confirmation",
-                       self.handle_confirm_message)
+                       self.handle_contact_reply)
+        self.add_event("neon.messaging.contacts_changed",
+                       self.handle_invalidate_contacts)
+        self.add_event("neon.messaging.partial_utterance",
+                       self.handle_partial_utterance)
+        self.add_event("neon.messaging.mobile.ack",
+                       self.handle_mobile_ack)
+        self.add_event("neon.messaging.send_batch", self.handle_send_batch)
+        self.add_event("neon.messaging.stats", self.handle_get_stats)
+        self.add_event("neon.messaging.metrics", self.handle_get_metrics)
 
+    def handle_mobile_ack(self, message):
+        """
+        Handle the mobile client acknowledging a dispatched request
+        """
+        self.dispatcher.handle_ack(message.data.get("request_id"))
+
+    def handle_get_metrics(self, message):
+        """
+        Handle a request for entry point latencies and branch counts
+        """
+        if not self._answers_request(message):
+            return
+        self.bus.emit(message.response(
+            {**self.metrics.snapshot(), "worker_index": self._worker_index}))
+
+    def handle_get_stats(self, message):
+        """
+        Handle a request for internal skill statistics
+        """
+        if not self._answers_request(message):
+            return
+        self.bus.emit(message.response({"worker_index": self._worker_index,
+                                        "drafts": self.drafts.stats(),
+                                        "phone_cache": get_cache_stats(),
+                                        "dispatch": self.dispatcher.stats,
+                                        "lookups": self.lookups.stats,
+                                        "admission": self.admission.stats()
+                                        if self.admission else None}))
+
+    @timed("CMS_handle_send_message")
     def CMS_handle_send_message(self, message):
+        user = get_message_user(message)
+        if not self._owns_user(user) or not self._admit(user):
+            return
         self.make_active()
-        LOG.debug(message.data)
+        TRACER.trace("send_message", lambda: message.data)
         # utterance = message.data.get("request")
         data = message.data.get("skill_data")
         kind = data.get("kind")
@@ -79,24 +210,44 @@ class MessagingSkill(CommonMessageSkill):
         elif kind == "klat":
             self.handle_send_private(message)
 
+    @timed("CMS_match_message_phrase")
     def CMS_match_message_phrase(self, request, context):
         """
         Common Messaging skill match evaluation
         :param request: (str) user input
         :return: (dict) confidence, optional: kind, recipient, message, subject
         """
+        user = self._context_user(context)
+        if not self._owns_user(user):
+            return None
+        with self._partials_lock:
+            parse = self._partials.pop(user, None)
+        if parse:
+            # Only the tokens changed since the last partial are parsed
+            self.metrics.count("match.streamed")
+            parse.update(request)
+            kind = parse.kind
+        else:
+            kind = self._get_matcher().match_kind(request)
         return_data = {}
-        if self.voc_match(request, "klat"):
-            return_data["conf"] = CMSMatchLevel.EXACT
-            return_data["kind"] = "klat"
-        elif self.voc_match(request, "email"):
+        if kind:
+            self.metrics.count(f"match.kind.{kind}")
             return_data["conf"] = CMSMatchLevel.EXACT
-            return_data["kind"] = "email"
-        elif self.voc_match(request, "sms"):
-            return_data["conf"] = CMSMatchLevel.EXACT
-            return_data["kind"] = "sms"
+            return_data["kind"] = kind
         else:
-            recipient, message, conf = self._extract_content_sms(request)
+            self.metrics.count("match.extractor.sms")
+            if not parse:
+                # The SMS and email extractors share one token list and
+                # the recipient phrase is only searched for once
+                phrases = self.phrases.get(self.lang)
+                tokens = request.split()
+                to = phrases.find(tokens, phrases.to)
+            recipient, message, conf = parse.sms() if parse else \
+                extract_sms(tokens, to, phrases)
+            if recipient:
+                TRACER.trace("extract_sms", lambda: {
+                    "utterance": request, "recipient": recipient,
+                    "message": message, "conf": conf})
             if conf == CMSMatchLevel.MEDIA:
                 return_data["kind"] = "sms"
             if recipient and message:
@@ -107,7 +258,13 @@ class MessagingSkill(CommonMessageSkill):
                 return_data["conf"] = CMSMatchLevel.LOOSE
                 return_data["recipient"] = recipient
             else:
-                recipient, subject = self._extract_content_email(request)
+                self.metrics.count("match.extractor.email")
+                recipient, subject = parse.email() if parse else \
+                    extract_email(tokens, to, phrases)
+                if recipient:
+                    TRACER.trace("extract_email", lambda: {
+                        "utterance": request, "recipient": recipient,
+                        "subject": subject})
                 return_data["kind"] = "email"
                 if recipient and subject:
                     return_data["conf"] = CMSMatchLevel.MEDIA
@@ -117,187 +274,381 @@ class MessagingSkill(CommonMessageSkill):
                     return_data["conf"] = CMSMatchLevel.LOOSE
                     return_data["recipient"] = recipient
                 else:
+                    self.metrics.count("match.none")
                     return_data = None
+        if return_data and return_data.get("recipient"):
+            self._resolve_recent_recipient(user, return_data)
         return return_data
 
+    def handle_partial_utterance(self, message):
+        """
+        Handle a partial transcript from streaming STT. Each partial updates
+        the user's parse incrementally so the final utterance is matched in
+        `CMS_match_message_phrase` without parsing it from the start.
+        """
+        user = get_message_user(message)
+        utterance = message.data.get("utterance")
+        if not utterance or not self._owns_user(user):
+            return
+        with self._partials_lock:
+            parse = self._partials.pop(user, None)
+            if parse is None:
+                parse = UtteranceParse(self.phrases.get(self.lang),
+                                       self._get_matcher())
+            while len(self._partials) >= self._max_partials:
+                self._partials.popitem(last=False)
+            self._partials[user] = parse
+            parse.update(utterance)
+
+    def _resolve_recent_recipient(self, user: str,
+                                  match_data: dict) -> Optional[RecentRecipient]:
+        """
+        Replace a matched recipient name with the recent recipient it refers
+        to. Confidence is only raised if the full name or a whole word of it
+        was matched; loose matches are left unchanged.
+        @param user: user making the request
+        @param match_data: CMS match data with a "recipient"
+        @return: matched RecentRecipient, else None
+        """
+        recipient = match_data["recipient"]
+        if match_data["conf"] == CMSMatchLevel.LOOSE or \
+                classify_recipient(recipient).kind not in (NAME, MIXED):
+            return None
+        recent = self.recipients.find(user, recipient)
+        if recent:
+            match_data["conf"] = RAISED_CONFIDENCE.get(match_data["conf"],
+                                                       match_data["conf"])
+        else:
+            recent = self.recipients.complete(user, recipient)
+        if recent:
+            self.metrics.count("match.recent_recipient")
+            match_data["recipient"] = recent.name
+        return recent
+
+    def _load_vocab(self, name: str, lang: str) -> List[str]:
+        """
+        Get phrases from a vocab file
+        @param name: vocab name
+        @param lang: language to load vocab for
+        @return: list of phrases, empty if the vocab file does not exist
+        """
+        try:
+            return self.voc_list(name, lang)
+        except FileNotFoundError:
+            return []
+
+    def _get_matcher(self, lang: str = None) -> MessageMatcher:
+        """
+        Get the message kind matcher for a language, compiling it on first use
+        @param lang: language to get a matcher for, default self.lang
+        @return: MessageMatcher for the requested language
+        """
+        lang = lang or self.lang
+        if lang not in self._matchers:
+            vocab = {kind: self._load_vocab(kind, lang)
+                     for kind in ("klat", "email", "sms")}
+            self._matchers[lang] = MessageMatcher(vocab)
+        return self._matchers[lang]
+
+    def _get_confirmation(self, lang: str = None) -> ConfirmationClassifier:
+        """
+        Get the yes/no reply classifier for a language, building it on first
+        use
+        @param lang: language to get a classifier for, default self.lang
+        @return: ConfirmationClassifier for the requested language
+        """
+        lang = lang or self.lang
+        if lang not in self._confirmations:
+            vocab = {input_class: self._load_vocab(input_class, lang)
+                     for input_class in ("no", "yes")}
+            self._confirmations[lang] = ConfirmationClassifier(vocab)
+        return self._confirmations[lang]
+
+    def _speak_prompt(self, name: str, data: dict = None, **kwargs):
+        """
+        Speak a dialog rendered from the dialog cache, falling back to
+        `speak_dialog` if it is not available.
+        @param name: name of the dialog to speak
+        @param data: slot values for the dialog
+        @param kwargs: additional arguments passed to `speak`
+        """
+        utterance = self.dialog_cache.render(name, self.lang, data)
+        if utterance is None:
+            self.speak_dialog(name, data, **kwargs)
+        else:
+            self.speak(utterance, meta={"dialog": name, "data": data or {}},
+                       **kwargs)
+
+    def _admit(self, user: str) -> bool:
+        """
+        Check a user's request against the rate limit, telling the user to
+        wait if it is rejected
+        @param user: user making the request
+        @return: True if the request should be handled
+        """
+        if self.admission is None or self.admission.admit(user):
+            return True
+        LOG.info(f"Rate limited request from {user}")
+        self.metrics.count("admission.rejected")
+        self._speak_prompt("RateLimited", private=True)
+        return False
+
+    def _owns_user(self, user: str) -> bool:
+        """
+        Check if this skill worker serves requests for a user
+        @param user: user to check
+        @return: True if this worker handles `user`
+        """
+        return self._worker_count == 1 or \
+            shard_index(user, self._worker_count) == self._worker_index
+
+    def _answers_request(self, message) -> bool:
+        """
+        Check if this skill worker responds to a request for its internal
+        state. A request may name a `worker_index`; otherwise the worker
+        serving the requesting user responds.
+        @param message: request Message
+        @return: True if this worker should respond
+        """
+        worker_index = message.data.get("worker_index")
+        if worker_index is None:
+            return self._owns_user(get_message_user(message))
+        return worker_index == self._worker_index
+
+    def _journal_path(self, name: str) -> str:
+        """
+        Get the path to a journal database. Each skill worker keeps its own
+        journal so workers never restore state for users they do not serve.
+        @param name: name of the journal
+        @return: path to the journal database file
+        """
+        if self._worker_count > 1:
+            name = f"{name}-{self._worker_index}"
+        return join(self.file_system.path, f"{name}.db")
+
+    @staticmethod
+    def _context_user(context: dict) -> str:
+        """
+        Get the user a CMS match request is for, resolved the same way as
+        for bus handlers
+        @param context: context of the request message
+        @return: requesting user
+        """
+        return get_message_user(Message("", context=context))
+
+    @timed("CMS_handle_place_call")
     def CMS_handle_place_call(self, message):
+        user = get_message_user(message)
+        if not self._owns_user(user) or not self._admit(user):
+            return
         self.make_active()
         self.handle_place_call(message)
 
+    @timed("CMS_match_call_phrase")
     def CMS_match_call_phrase(self, contact, context):
-        contact_as_number = re.findall(r'\d', contact)
-        if len(contact_as_number) >= 7:
-            name = contact
-            number = "".join(contact_as_number)
-            confidence = CMSMatchLevel.EXACT
+        user = self._context_user(context)
+        if not self._owns_user(user):
+            return None
+        number, confidence = self._extract_content_call(contact)
+        self.metrics.count("call.number" if number else "call.name")
+        match_data = {"conf": confidence, "number": number, "recipient": contact, "kind": "call"}
+        if not number:
+            recent = self._resolve_recent_recipient(user, match_data)
+            if recent and recent.addresses.get(CallDraft.contact_address):
+                match_data["number"] = \
+                    recent.addresses[CallDraft.contact_address]
+        return match_data
+
+    def handle_contact_reply(self, message):
+        """
+        Handle contact data for a draft from the mobile client. Replies to
+        lookups that timed out or were superseded by a newer draft or
+        recipient are discarded.
+        """
+        user = message.data.get("sender")
+        if not self._owns_user(user):
+            return
+        request_id = message.data.get("request_id")
+        if request_id:
+            # A reply also acknowledges the dispatched lookup request
+            self.dispatcher.handle_ack(request_id)
+            lookup = self.lookups.get(request_id)
+            if not lookup or lookup.user != user or \
+                    not lookup.is_current(self.drafts.get(user)):
+                LOG.debug(f"Discarding contact reply {request_id}")
+                self.metrics.count("lookup.discarded")
+                self.lookups.resolve(request_id)
+                return
+        if not self._admit(user):
+            # The draft cannot be confirmed without this reply
+            self._cancel_lookups(user)
+            draft = self.drafts.pop(user)
+            if draft and draft.kind == EmailDraft.kind:
+                draft.body.close()
+            return
+        if request_id:
+            if not self.lookups.resolve(request_id):
+                # Timed out while being admitted
+                return
         else:
-            name = contact
-            number = None
-            confidence = CMSMatchLevel.MEDIA
-        return {"conf": confidence, "number": number, "recipient": name, "kind": "call"}
+            self._cancel_lookups(user)
+        self.handle_confirm_message(message)
+
+    def _handle_lookup_timeout(self, lookup: PendingLookup):
+        """
+        Continue a draft without contact data when the mobile client does not
+        reply to a lookup, so the user is told the contact was not found
+        instead of waiting indefinitely.
+        @param lookup: lookup that timed out
+        """
+        self.metrics.count("lookup.timed_out")
+        self.dispatcher.cancel(lookup.request_id)
+        if not lookup.is_current(self.drafts.get(lookup.user)):
+            return
+        self.handle_confirm_message(lookup.message.forward(
+            "neon.messaging.confirmation", {"sender": lookup.user}))
 
+    def _cancel_lookups(self, user: str):
+        """
+        Stop waiting for contact lookups for a user and stop re-sending them
+        @param user: user to cancel lookups for
+        """
+        for request_id in self.lookups.cancel(user):
+            self.dispatcher.cancel(request_id)
+
+    @timed("handle_confirm_message")
     def handle_confirm_message(self, message):
-        # LOG.debug(message.data)
+        if not self._owns_user(message.data.get("sender")):
+            return
         try:
             user = message.data.get("sender")
             draft = self.drafts[user]
-            message.context["klat_data"] = draft["context"]["klat_data"]
-            LOG.debug(f"message.data={message.data}")
-            LOG.debug(f"draft={draft}")
+            if draft.klat_data is not None:
+                message.context["klat_data"] = draft.klat_data
             if message.data.get("contact_data") and message.data.get("contact_data") != "None":
                 contact_data: dict = message.data.get("contact_data")
-                LOG.debug(f"contact_data={contact_data}")
-                if len(contact_data) > 1:
-                    # TODO: Disambiguate multiple contacts here
-                    pass
-                LOG.debug(contact_data.keys())
-                LOG.debug(list(contact_data.keys()))
-                contact = list(contact_data.keys())[0]
-                LOG.debug(contact)
-                draft["recipient"] = contact
-
-                if draft["kind"] in ("text message", "call"):
-                    # Get phone number in priority order
-                    if "mobile" in contact_data[contact]:
-                        address = contact_data[contact]["mobile"]
-                    elif "work mobile" in contact_data[contact]:
-                        address = contact_data[contact]["work mobile"]
-                    elif "home" in contact_data[contact]:
-                        address = contact_data[contact]["home"]
-                    elif "work" in contact_data[contact]:
-                        address = contact_data[contact]["work"]
-                    elif "other" in contact_data[contact]:
-                        address = contact_data[contact]["other"]
-                    elif "phone" in contact_data[contact]:
-                        address = contact_data[contact]["phone"]
-                    else:
-                        address = None
-                    draft["number"] = address
-
-                elif draft["kind"] == "email":
-                    if "email" in contact_data[contact]:
-                        address = contact_data[contact]["email"]
-                    else:
-                        address = None
+                if message.data.get("cached"):
+                    # Not re-added, so cached contacts still expire
+                    best = Contact.from_contact_data(
+                        *next(iter(contact_data.items())))
+                else:
+                    # Multiple contacts are ordered by similarity to the
+                    # request
+                    best = self.contacts.update(user, contact_data,
+                                                draft.recipient)[0]
+                contact = best.name
+                draft.recipient = contact
 
+                if draft.contact_address:
+                    address = getattr(best, draft.contact_address)
+                    if draft.kind != EmailDraft.kind:
+                        draft.number = address
                 else:
-                    LOG.warning(f'requested send {draft["kind"]}')
+                    LOG.warning(f'requested send {draft.kind}')
                     address = None
 
-            elif draft["kind"] == "email" and "@" in draft["recipient"]:
-                LOG.debug("email to email address")
-                address = draft["recipient"]
+            elif draft.kind == "email" and \
+                    draft.recipient_class.kind == EMAIL:
+                address = draft.recipient
                 contact = address
-            elif draft["kind"] == "text message" and draft["recipient"].replace('-', '').isnumeric():
-                LOG.debug("text message to phone number")
-                address = draft["recipient"]
-                try:
-                    contact = phonenumbers.format_number(phonenumbers.parse(draft["recipient"], "US"),
-                                                         phonenumbers.PhoneNumberFormat.NATIONAL)
-                except Exception as e:
-                    LOG.error(e)
-                    contact = address
-            elif draft["kind"] == "call":
-                address = draft["number"].strip()
-                # contact = draft["recipient"]
-                contact = phonenumbers.format_number(phonenumbers.parse(draft["recipient"], "US"),
-                                                     phonenumbers.PhoneNumberFormat.NATIONAL)
-                if address == draft["recipient"]:
+            elif draft.kind == "text message" and \
+                    draft.recipient_class.kind == NUMBER:
+                address = draft.recipient
+                phone = normalize_phone(draft.recipient)
+                contact = phone.national if phone else address
+            elif draft.kind == "call" and draft.number:
+                address = draft.number.strip()
+                # contact = draft.recipient
+                phone = normalize_phone(draft.recipient)
+                contact = phone.national if phone else draft.recipient
+                if address == draft.recipient:
                     address = contact
             else:
                 LOG.warning("No recipient found!")
                 address = None
                 contact = None
 
-            LOG.debug(f"DM: draft={draft}")
+            TRACER.trace("confirm_message", lambda: {
+                "data": message.data, "draft": draft, "contact": contact,
+                "address": address})
             if address:
-                if draft["kind"] == "email":
-                    msg = draft["subject"]
-                elif draft["kind"] == "text message":
-                    msg = draft["message"]
+                if draft.kind == "email":
+                    msg = draft.subject
+                elif draft.kind == "text message":
+                    msg = draft.message
                 else:
                     msg = None
-                LOG.debug(f"msg={msg}")
-                draft["recipient"] = address
+                draft.recipient = address
                 if contact == address:
                     speak_addr = ""
                 else:
                     speak_addr = f"({address})"
-                LOG.debug(speak_addr)
-                LOG.debug(draft["kind"])
-                if draft["kind"] == "call":
-                    self.speak_dialog("ConfirmCall", {"name": contact, "number": speak_addr},
-                                      private=True, message=message)
-                    draft["name"] = contact
+                draft.name = contact
+                if draft.kind == "call":
+                    self._speak_prompt("ConfirmCall", {"name": contact, "number": speak_addr},
+                                       private=True, message=message)
                 else:
-                    self.speak_dialog("ConfirmMessage", {"kind": draft["kind"], "name": contact,
-                                                         "address": speak_addr, "message": msg},
-                                      private=True, message=message)
-                    if draft["kind"] == "email":
-                        self.speak_dialog("ConfirmEmail", private=True, message=message)
+                    self._speak_prompt("ConfirmMessage", {"kind": draft.kind, "name": contact,
+                                                          "address": speak_addr, "message": msg},
+                                       private=True, message=message)
+                    if draft.kind == "email":
+                        self._speak_prompt("ConfirmEmail", private=True, message=message)
                     else:
-                        self.speak_dialog("ConfirmSend", private=True, message=message)
-            elif draft["recipient"]:
-                LOG.debug(f"DM: no contact or address for: {draft}")
-                if draft["kind"] == "email":
-                    addr_type = "email address"
-                elif draft["kind"] == "text message":
-                    addr_type = "phone number"
-                else:
-                    addr_type = "contact info"
-                LOG.debug(draft)
-                LOG.debug(draft["recipient"])
-                self.speak_dialog("ContactNotFound", {"kind": addr_type, "recipient": draft["recipient"]}, private=True)
+                        self._speak_prompt("ConfirmSend", private=True, message=message)
+            elif draft.recipient:
+                self.speak_dialog("ContactNotFound", {"kind": draft.address_type,
+                                                      "recipient": draft.recipient},
+                                  private=True)
                 self.drafts.pop(user)
             else:
                 self.speak_dialog("ErrorDialog", private=True)
                 self.drafts.pop(user)
+            self.drafts.save(user)
         except Exception as e:
             LOG.error(e)
             self.speak_dialog("ErrorDialog", private=True)
 
     def handle_send_email(self, message):
-        LOG.debug(message.data)
         user = get_message_user(message)
+        if not self._owns_user(user):
+            return
+        TRACER.trace("send_email", lambda: message.data)
         # if self.neon_in_request(message) and message.context["mobile"]:
         if request_from_mobile(message):
             # if self.server:
             #     user = nick(message.context["flac_filename"])
             # LOG.debug(f"DM: {self.drafts[user]}")
-            self.drafts[user] = {"kind": "email",
-                                 "recipient": "",
-                                 "subject": "",
-                                 "body": "",
-                                 "context": message.context,
-                                 # "flac_filename": message.context["flac_filename"],
-                                 "next_input": "recipient"}
+            draft = EmailDraft(klat_data=message.context.get("klat_data"))
 
             # Check for data from CMS match
             match_data = message.data.get("skill_data")
             recipient = match_data.get("recipient")
             subject = match_data.get("subject")
             if not recipient and not subject:
-                recipient, subject = self._extract_content_email(message.context["cc_data"].get("raw_utterance"))
+                recipient, subject = self._extract_content_email(
+                    message.context["cc_data"].get("raw_utterance"),
+                    self.phrases.get(self.lang))
 
             # Continue to body of email
             if recipient and subject:
-                self.drafts[user]["recipient"] = recipient
-                self.drafts[user]["subject"] = subject
-                self.drafts[user]["next_input"] = "body"
-                self.speak_dialog("GetEmailBody", private=True, expect_response=True)
+                draft.recipient = recipient
+                draft.subject = subject
+                draft.next_input = "body"
+                self._speak_prompt("GetEmailBody", private=True, expect_response=True)
             elif recipient:
-                self.drafts[user]["recipient"] = recipient
-                self.drafts[user]["next_input"] = "subject"
-                self.speak_dialog("GetEmailSubject", private=True, expect_response=True)
+                draft.recipient = recipient
+                draft.next_input = "subject"
+                self._speak_prompt("GetEmailSubject", private=True, expect_response=True)
             else:
                 self.speak_dialog("GetRecipientAddress", {"kind": "email"}, private=True, expect_response=True)
+            self.drafts[user] = draft
         else:
             # TODO: Yagmail implementation see mycroft.api.CouponEmail
             self.speak_dialog("OnlyMobile", {"action": "send emails"}, private=True)
             # self.speak("I'm only able to send emails from mobile devices right now.")
 
     def handle_send_sms(self, message):
-        LOG.debug(message)
+        TRACER.trace("send_sms", lambda: message.data)
         user = get_message_user(message)
         # if self.neon_in_request(message) and message.context["mobile"]:
         if request_from_mobile(message):
@@ -311,40 +662,27 @@ class MessagingSkill(CommonMessageSkill):
             recipient = match_data.get("recipient")
             sms = match_data.get("message")
             if not recipient and not sms:
-                recipient, sms, _ = self._extract_content_sms(message.data.get("request"))
+                recipient, sms, _ = self._extract_content_sms(
+                    message.data.get("request"), self.phrases.get(self.lang))
             # recipient, sms = self._extract_content_sms(message.data.get("utterance"))
             if recipient and sms:
-                self.drafts[user] = {"kind": "text message",
-                                     "recipient": recipient,
-                                     "message": sms,
-                                     "context": message.context,
-                                     # "flac_filename": flac_filename,
-                                     "next_input": "confirmation"}
+                self.drafts[user] = SmsDraft(
+                    recipient, sms, next_input="confirmation",
+                    klat_data=message.context.get("klat_data"))
                 if request_from_mobile(message):
-                    pass
-                    # TODO
-                    # self.mobile_skill_intent("get_contact", {"recipient": recipient}, message)
-                    # self.socket_io_emit('get_contact', f"&recipient={recipient}",
-                    #                     message.context["flac_filename"])
+                    self._request_contact(message, user, self.drafts[user])
                 else:
                     self.speak_dialog("OnlyMobile", {"action": "send text messages"}, private=True)
                     # self.speak("This skill is currently only available for Android users.")
                 # self._send_sms(message, user)
             elif recipient:
-                self.drafts[user] = {"kind": "text message",
-                                     "recipient": recipient,
-                                     "message": "",
-                                     "context": message.context,
-                                     # "flac_filename": flac_filename,
-                                     "next_input": "message"}
+                self.drafts[user] = SmsDraft(
+                    recipient, next_input="message",
+                    klat_data=message.context.get("klat_data"))
                 self.speak("What is the message?", private=True, expect_response=True)
             else:
-                self.drafts[user] = {"kind": "text message",
-                                     "recipient": "",
-                                     "message": "",
-                                     "context": message.context,
-                                     # "flac_filename": flac_filename,
-                                     "next_input": "recipient"}
+                self.drafts[user] = SmsDraft(
+                    klat_data=message.context.get("klat_data"))
                 self.speak_dialog("GetRecipientAddress", {"kind": "email"}, private=True, expect_response=True)
         else:
             self.speak_dialog("OnlyMobile", {"action": "send text messages"}, private=True)
@@ -357,261 +695,345 @@ class MessagingSkill(CommonMessageSkill):
             # if self.server:
             #     user = nick(flac_filename)
             call_data = message.data["skill_data"]
-            LOG.debug(call_data)
+            TRACER.trace("place_call", lambda: call_data)
             number = call_data["number"]
             recipient = call_data["recipient"]
-            self.drafts[user] = {"kind": "call",
-                                 "recipient": recipient,
-                                 "number": number,
-                                 "context": message.context}
+            draft = CallDraft(recipient, number, next_input="confirmation",
+                              klat_data=message.context.get("klat_data"))
+            self.drafts[user] = draft
             if number:
                 message.data["sender"] = user
                 self.handle_confirm_message(message)
-            # else:
-                # TODO
-                # self.mobile_skill_intent("get_contact", {"recipient": recipient}, message)
-                # self.socket_io_emit('get_contact', f"&recipient={recipient}",
-                #                     message.context["flac_filename"])
+            else:
+                self._request_contact(message, user, draft)
         else:
-            LOG.debug(message.data["skill_data"])
             self.speak_dialog("OnlyMobile", {"action": "call phone numbers"}, private=True)
 
+    def _request_contact(self, message, user, draft):
+        """
+        Resolve contact info for a draft's recipient, confirming immediately
+        if the recipient matches a contact previously returned by the mobile
+        client.
+        @param message: Message associated with the request
+        @param user: user the draft belongs to
+        @param draft: Draft to resolve the recipient of
+        """
+        contact = self.contacts.lookup(user, draft.recipient)
+        recent = None if contact else \
+            self.recipients.complete(user, draft.recipient)
+        address = recent.addresses.get(draft.contact_address) \
+            if recent else None
+        if contact:
+            TRACER.trace("cached_contact", lambda: {
+                "recipient": draft.recipient, "contact": contact.name})
+            self.handle_confirm_message(message.forward(
+                "neon.messaging.confirmation",
+                {"sender": user, "cached": True,
+                 "contact_data": {contact.name: contact.data}}))
+        elif address:
+            # Use the address last sent to instead of a fresh lookup
+            TRACER.trace("recent_recipient", lambda: {
+                "recipient": draft.recipient, "contact": recent.name})
+            self.handle_confirm_message(message.forward(
+                "neon.messaging.confirmation",
+                {"sender": user, "cached": True,
+                 "contact_data": {recent.name: {draft.contact_address:
+                                                address}}}))
+        else:
+            # The mobile client replies with `neon.messaging.confirmation`
+            # including this request ID. Tracking starts before sending so a
+            # fast reply is not discarded
+            request_id = str(uuid4())
+            self.lookups.start(request_id, user, draft, message)
+            if not self.dispatcher.send(message, "get_contact",
+                                        {"recipient": draft.recipient,
+                                         "sender": user}, request_id):
+                self._cancel_lookups(user)
+                self.speak_dialog("ErrorDialog", private=True)
+                self.drafts.pop(user)
+
+    def handle_invalidate_contacts(self, message):
+        """
+        Handle a notification that a user's contacts changed on the mobile
+        client, so cached contacts are not used.
+        """
+        user = get_message_user(message)
+        if self._owns_user(user):
+            self.contacts.invalidate(user)
+
+    def handle_send_batch(self, message):
+        """
+        Handle a request to send messages to many recipients as a single
+        grouped mobile request. `recipients` is a list of phone numbers or
+        email addresses; `messages` is a list of messages, one per recipient,
+        or `message` is sent to every recipient.
+        """
+        user = get_message_user(message)
+        if not self._owns_user(user):
+            return
+        if not self._admit(user):
+            self.bus.emit(message.response({"error": "rate limited"}))
+            return
+        kind = message.data.get("kind", "sms")
+        recipients = message.data.get("recipients") or []
+        messages = message.data.get("messages") or \
+            [message.data.get("message")] * len(recipients)
+        subject = message.data.get("subject", "")
+        if not request_from_mobile(message):
+            error = "not a mobile request"
+        elif kind not in ("sms", "email"):
+            error = f"unsupported kind: {kind}"
+        elif any(text is None for text in messages):
+            error = "no message given"
+        elif not recipients or len(messages) != len(recipients):
+            error = "recipients and messages do not match"
+        else:
+            error = None
+        if error:
+            LOG.error(f"Batch send failed: {error}")
+            self.bus.emit(message.response({"error": error}))
+            return
+
+        if kind == "sms":
+            phones = [normalize_phone(str(r)) for r in recipients]
+            batch = [{"number": phone.digits, "text": text}
+                     for phone, text in zip(phones, messages) if phone]
+            invalid = [r for r, phone in zip(recipients, phones) if not phone]
+        else:
+            addresses = [str(r).strip().lower() for r in recipients]
+            batch = [{"recipient": address, "subject": subject, "body": text}
+                     for address, text in zip(addresses, messages)
+                     if "@" in address]
+            invalid = [r for r, address in zip(recipients, addresses)
+                       if "@" not in address]
+        request_id = None
+        if batch:
+            request_id = self.dispatcher.send(message, f"{kind}_batch",
+                                              {"messages": batch})
+        self.bus.emit(message.response({"request_id": request_id,
+                                        "queued": len(batch) if request_id else 0,
+                                        "invalid": invalid}))
+
     def handle_send_private(self, message):
         pass
         # TODO: Draft and send private message via Klat DM
 
+    @timed("converse")
     def converse(self, message=None):
-        utterances = message.data.get("utterances")
-        LOG.info(f"utterances={utterances}")
-        LOG.debug(f"message.data={message.data}")
         user = get_message_user(message)
+        if not self._owns_user(user):
+            return False
         # if self.server:
         #     user = nick(message.context["flac_filename"])
 
         # Check if user has started a draft
-        if self.drafts and user in self.drafts:
-            data = self.drafts[user]
-            LOG.debug(data)
-
-            # Email Draft
-            if data["kind"] == "email":
-                # Parse Email Address
-                if data["next_input"] == "recipient":
-                    data["recipient"] = str(utterances[0]).strip().replace(' ', '.')
-                    data["next_input"] = "subject"
-                    self.speak_dialog("GetEmailSubject", private=True, expect_response=True)
-                # Add Subject Line
-                elif data["next_input"] == "subject":
-                    data["subject"] = str(utterances[0]).strip()
-                    data["next_input"] = "body"
-                    self.speak_dialog("GetEmailBody", private=True, expect_response=True)
-                # Email Draft Finished
-                elif data["next_input"] == "body" and utterances[0] == "done":
-                    # self.speak("Email Complete")
-                    LOG.info(data)
-                    data["next_input"] = "confirmation"
-                    # self.speak("Would you like to send your message?")
-                    if request_from_mobile(message):
-                        pass
-                        # TODO
-                        # self.mobile_skill_intent("get_contact", {"recipient": data['recipient']}, message)
-                        # self.socket_io_emit('get_contact', f"&recipient={data['recipient']}",
-                        #                     message.context["flac_filename"])
-                    else:
-                        self.speak_dialog("ConfirmMessage", {"kind": "email",
-                                                             "name": data["recipient"],
-                                                             "address": "",
-                                                             "message": data["subject"]},
-                                          private=True, expect_response=True)
-                        self.speak_dialog("ConfirmSend", private=True, expect_response=True)
-                elif data["next_input"] == "confirmation":
-                    if [word for word in ("no", "cancel", "discard", "nope", "stop", "don't") if word in utterances[0]]:
-                        self.speak_dialog("DiscardDraft", private=True)
-                        self.drafts.pop(user)
-                    elif [word for word in ("yes", "confirm", "affirmative", "send", "okay", "go", "sure", "ok")
-                          if word in utterances[0]]:
-                        self._send_email(message, user)
-                    else:
-                        return False
-                # Append input to Email Body
-                else:
-                    data["body"] += str(utterances[0]) + "\n"
-            # SMS Draft
-            elif data["kind"] == "text message":
-                if data["next_input"] == "recipient":
-                    data["recipient"] = str(utterances[0]).strip()
-                    data["next_input"] = "message"
-                    self.speak("What is the message?", private=True, expect_response=True)
-                elif data["next_input"] == "message":
-                    data["message"] = str(utterances[0]).strip()
-                    data["next_input"] = "confirmation"
-                    # TODO
-                    # self.mobile_skill_intent("get_contact", {"number": data['recipient']}, message)
-                    # self.socket_io_emit('get_contact', f"&number={data['recipient']}",
-                    #                     message.context["flac_filename"])
-                elif data["next_input"] == "confirmation":
-                    # Check if send is declined
-                    if self.voc_match(utterances[0], "no"):
-                        # if [word for word in ("no", "cancel", "discard", "nope", "stop", "don't")
-                        #     if word in utterances[0]]:
-                        self.speak_dialog("DiscardDraft", private=True)
-                        self.drafts.pop(user)
-                    # Check if send is approved
-                    elif self.voc_match(utterances[0], "yes"):
-                        # elif [word for word in ("yes", "confirm", "affirmative", "send", "okay", "go", "sure", "ok")
-                        #       if word in utterances[0]]:
-                        self._send_sms(message, user)
-                    # Not a response, not converse
-                    else:
-                        return False
-            elif data["kind"] == "call":
-                LOG.debug("Call response")
-                if self.voc_match(utterances[0], "no"):
-                    self.speak_dialog("DiscardDraft", private=True)
-                    self.drafts.pop(user)
-                elif self.voc_match(utterances[0], "yes"):
-                    LOG.debug("Call confirmed!")
-                    self._place_call(message, user)
-                else:
-                    return False
-            return True
-        return False
+        self.drafts.expire()
+        data = self.drafts.get(user)
+        if not data:
+            self.metrics.count("converse.no_draft")
+            return False
+        self.metrics.count(f"converse.{data.kind}")
+        utterances = message.data.get("utterances")
+        TRACER.trace("converse", lambda: {"utterances": utterances,
+                                          "draft": data})
+        input_class = self._classify_input(data, utterances[0])
+        transition = self._transitions.get((data.kind, data.next_input,
+                                            input_class))
+        if not transition:
+            # Not a response, not converse
+            return False
+        action, next_state = transition
+        if next_state:
+            data.next_input = next_state
+        action(message, user, data, str(utterances[0]))
+        # The journal coalesces saves, so a draft is written at most once per
+        # flush interval however many lines are dictated
+        self.drafts.save(user)
+        return True
+
+    def _classify_input(self, draft, utterance: str) -> str:
+        """
+        Classify a user response to a draft in its current state
+        @param draft: Draft being responded to
+        @param utterance: user response
+        @return: name of the matched input class, else TEXT
+        """
+        input_classes = DRAFT_INPUTS.get((draft.kind, draft.next_input), ())
+        if draft.next_input == "confirmation":
+            return self._get_confirmation().classify(utterance,
+                                                     input_classes) or TEXT
+        for input_class in input_classes:
+            if self.voc_match(utterance, input_class,
+                              exact=input_class == "done"):
+                return input_class
+        return TEXT
+
+    def _draft_set_email_recipient(self, message, user, draft, utterance):
+        phrases = self.phrases.get(self.lang)
+        draft.recipient = normalize_spoken_email(utterance, phrases.at,
+                                                 phrases.symbols) or \
+            utterance.strip().replace(' ', '.')
+        self._speak_prompt("GetEmailSubject", private=True, expect_response=True)
+
+    def _draft_set_subject(self, message, user, draft, utterance):
+        draft.subject = utterance.strip()
+        self._speak_prompt("GetEmailBody", private=True, expect_response=True)
+
+    def _draft_append_body(self, message, user, draft, utterance):
+        if not draft.body.append(utterance):
+            self.speak_dialog("EmailBodyFull", private=True,
+                              expect_response=True)
+
+    def _draft_finish_email(self, message, user, draft, utterance):
+        if request_from_mobile(message):
+            self._request_contact(message, user, draft)
+        else:
+            self._speak_prompt("ConfirmMessage", {"kind": "email",
+                                                  "name": draft.recipient,
+                                                  "address": "",
+                                                  "message": draft.subject},
+                               private=True, expect_response=True)
+            self._speak_prompt("ConfirmSend", private=True, expect_response=True)
+
+    def _draft_set_recipient(self, message, user, draft, utterance):
+        draft.recipient = utterance.strip()
+        self.speak("What is the message?", private=True, expect_response=True)
+
+    def _draft_set_message(self, message, user, draft, utterance):
+        draft.message = utterance.strip()
+        self._request_contact(message, user, draft)
+
+    def _draft_discard(self, message, user, draft, utterance):
+        self.speak_dialog("DiscardDraft", private=True)
+        self.drafts.pop(user)
+        self._cancel_lookups(user)
+        if draft.kind == EmailDraft.kind:
+            draft.body.close()
+
+    def _draft_send_email(self, message, user, draft, utterance):
+        self._send_email(message, user)
+
+    def _draft_send_sms(self, message, user, draft, utterance):
+        self._send_sms(message, user)
+
+    def _draft_place_call(self, message, user, draft, utterance):
+        self._place_call(message, user)
 
     def _place_call(self, message, user):
         data = self.drafts[user]
         self.drafts.pop(user)
-        LOG.debug(f"data={data}")
-        number = data.get("number")
-        name = data.get("name")
+        TRACER.trace("dispatch_call", lambda: {"draft": data})
+        number = data.number
+        name = data.name
+        if not number:
+            LOG.error(f"No number to call for {data.recipient}")
+            self.speak_dialog("ContactNotFound", {"kind": data.address_type,
+                                                  "recipient": data.recipient},
+                              private=True)
+            return
         self.speak(f"Calling {name}.", private=True)  # TODO: Dialog file DM
+        self.recipients.record(user, name, data.contact_address, number)
         if request_from_mobile(message):
-            num = ''.join(re.findall(r'\d', number))
-            # TODO
-            # self.mobile_skill_intent("call", {"number": num}, message)
-            # self.socket_io_emit('call', f"&number={num}", message.context["flac_filename"])
+            self.dispatcher.send(message, "call",
+                                 {"number": extract_digits(number)})
 
     def _send_sms(self, message, user):
         self.speak_dialog("TextSent")  # TODO: Private?
         data = self.drafts[user]
-        recipient = data["recipient"]
-        if any(x.isalpha() for x in recipient):
+        recipient = data.recipient
+        if data.recipient_class.kind != NUMBER:
             LOG.error("Recipient is not a number!")
         else:
-            recipient = re.sub('[^\d]+', '', recipient).strip()
-        LOG.info(recipient)
-        content = data["message"]
+            recipient = data.recipient_class.digits
+            self.recipients.record(user, data.name, data.contact_address,
+                                   recipient)
+        TRACER.trace("dispatch_sms", lambda: {"draft": data,
+                                              "number": recipient})
+        content = data.message
         self.drafts.pop(user)
 
         if request_from_mobile(message):
-            pass
-            # TODO
-            # self.mobile_skill_intent("sms", {"number": recipient,
-            #                                  "text": content}, message)
-            # self.socket_io_emit('sms', f"&number={recipient}&text={content}", message.context["flac_filename"])
+            self.dispatcher.send(message, "sms", {"number": recipient,
+                                                  "text": content})
 
     def _send_email(self, message, user):
         self.speak_dialog("EmailSent", private=True)
         data = self.drafts[user]
-        recipient = data["recipient"]
-        subject = data["subject"]
-        body = data["body"]
+        recipient = data.recipient
+        subject = data.subject
+        body = data.body.getvalue()
+        data.body.close()
         self.drafts.pop(user)
-        LOG.info(f"Send Email: {data}")
-        # TODO
-        # if request_from_mobile(message):
-        #     self.mobile_skill_intent("email", {"recipient": recipient,
-        #                                        "subject": subject,
-        #                                        "body": body}, message)
-        #     # self.socket_io_emit('email', f"&recipient={recipient}&subject={subject}&body={body}",
-        #     #                     message.context["flac_filename"])
+        self.recipients.record(user, data.name, data.contact_address,
+                               recipient)
+        TRACER.trace("dispatch_email", lambda: {"draft": data})
+        if request_from_mobile(message):
+            self.dispatcher.send(message, "email", {"recipient": recipient,
+                                                    "subject": subject,
+                                                    "body": body})
         # else:
         #     pass
         #     # # TODO: Send here DM
-        #     # self.bus.emit(Message("neon.email", {"title": data["subject"],
-        #     #                                      "email": data["recipient"],
-        #     #                                      "body": data["body"]}))
+        #     # self.bus.emit(Message("neon.email", {"title": data.subject,
+        #     #                                      "email": data.recipient,
+        #     #                                      "body": data.body}))
 
     @staticmethod
-    def _extract_content_sms(utt):
+    def _extract_content_sms(utt, phrases: ExtractionPhrases = None):
         """
         Attempts to parse SMS recipient and message, optionally returning either or both
         @param utt: (String) input text
-        @return: (String?, String?) recipient, message
+        @param phrases: extraction phrases for the input language
+        @return: (String?, String?, CMSMatchLevel?) recipient, message, conf
         """
-        LOG.debug(utt)
-        try:
-            # Parse out recipient
-            if "to" in utt.split():
-                remainder = utt.split(" to ", 1)[1]
-            else:
-                return None, None
-            LOG.debug(remainder)
-            recipient = remainder.split()[0]
-            LOG.debug(recipient)
-            remainder = " ".join(remainder.split()[1:])
-            LOG.debug(remainder)
-            # Parse out message
-
-            if "that says " in remainder:
-                recipient_to_append, message = remainder.split("that says ", 1)
-                recipient = " ".join([recipient, recipient_to_append]).strip()
-                conf = CMSMatchLevel.MEDIA
-            elif "saying " in remainder:
-                recipient_to_append, message = remainder.split("saying ", 1)
-                recipient = " ".join([recipient, recipient_to_append]).strip()
-                conf = CMSMatchLevel.MEDIA
-            elif len(remainder) <= 1:
-                message = None
-                recipient = " ".join((recipient, remainder))
-                conf = CMSMatchLevel.MEDIA
-            else:
-                message = remainder
-                conf = CMSMatchLevel.LOOSE
-        except Exception as e:
-            LOG.error(e)
-            recipient, message = None, None
-            conf = None
-        LOG.debug(f"recipient={recipient} | message={message}")
+        phrases = phrases or PHRASES.get("en-us")
+        tokens = utt.split()
+        recipient, message, conf = extract_sms(
+            tokens, phrases.find(tokens, phrases.to), phrases)
+        if recipient:
+            TRACER.trace("extract_sms", lambda: {
+                "utterance": utt, "recipient": recipient,
+                "message": message, "conf": conf})
         return recipient, message, conf
 
     @staticmethod
-    def _extract_content_email(utt):
-        LOG.debug(utt)
-        if "to" in utt.split():
-            remainder = utt.split(" to ", 1)[1]
-        else:
-            return None, None
-        LOG.debug(remainder)
-
-        if "subject" in remainder.split():
-            recipient_extended, subject = remainder.split(" subject ", 1)
-            LOG.debug(f"recip_ext={recipient_extended} | subject={subject}")
-            if "with" in recipient_extended.split():
-                recipient = recipient_extended.split(" with", 1)[0]
-            else:
-                recipient = recipient_extended
-            LOG.debug(f"recipient={recipient}")
-            # return recipient, subject
-        else:
-            recipient = remainder
-            subject = None
+    def _extract_content_call(contact):
+        """
+        Attempts to parse a phone number from a call contact
+        @param contact: (String) requested contact
+        @return: (String?, CMSMatchLevel) number, conf
+        """
+        contact_class = classify_recipient(contact)
+        if contact_class.kind != EMAIL and len(contact_class.digits) >= 7:
+            return contact_class.digits, CMSMatchLevel.EXACT
+        return None, CMSMatchLevel.MEDIA
 
-        # Parse out email words
+    @staticmethod
+    def _extract_content_email(utt, phrases: ExtractionPhrases = None):
+        """
+        Attempts to parse email recipient and subject, optionally returning either or both
+        @param utt: (String) input text
+        @param phrases: extraction phrases for the input language
+        @return: (String?, String?) recipient, subject
+        """
+        phrases = phrases or PHRASES.get("en-us")
+        tokens = utt.split()
+        recipient, subject = extract_email(
+            tokens, phrases.find(tokens, phrases.to), phrases)
         if recipient:
-            if "dot" in recipient.split():
-                recipient = recipient.replace(" dot ", ".")
-            if "at" in recipient.split():
-                recipient = recipient.replace(" at ", "@").lower()
-            if "@" in recipient:
-                # Look at domain (i.e. .com, .co.uk)
-                recipient_prefix = recipient.split("@", 1)[0].replace(" ", "")
-                recipient_domain = recipient.split("@", 1)[1].split(".")[0].replace(" ", "")
-                tld_parts = recipient.split("@", 1)[1].split(".")[1:]
-                domain_parts = [part.split()[0] for part in tld_parts]
-                tld = ".".join(domain_parts)
-                recipient = f"{recipient_prefix}@{recipient_domain}.{tld}"
-            LOG.info(f"DM: {recipient}")
+            TRACER.trace("extract_email", lambda: {
+                "utterance": utt, "recipient": recipient,
+                "subject": subject})
         return recipient, subject
 
     def stop(self):
         pass
+
+    def shutdown(self):
+        self.lookups.shutdown()
+        if self.dispatcher:
+            self.dispatcher.shutdown()
+        if self.drafts.journal:
+            self.drafts.journal.close()
+        if self.recipients.journal:
+            self.recipients.journal.close()
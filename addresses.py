@@ -0,0 +1,110 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from typing import Dict, FrozenSet, Optional
+
+# Spoken words separating the local part and domain of an address
+AT_WORDS = frozenset(("at",))
+# Spoken words for characters that may appear in an email address
+SPOKEN_SYMBOLS = {"dot": ".", "period": ".", "point": ".",
+                  "underscore": "_", "dash": "-", "hyphen": "-",
+                  "minus": "-", "plus": "+"}
+SPOKEN_DIGITS = {"zero": "0", "one": "1", "two": "2", "three": "3",
+                 "four": "4", "five": "5", "six": "6", "seven": "7",
+                 "eight": "8", "nine": "9"}
+
+# Top-level domains that may be spoken without a preceding "dot". TLDs that
+# are also common English words (i.e. "at", "in", "me") are excluded
+TLDS = frozenset(("com", "net", "org", "edu", "gov", "mil", "io", "co",
+                  "ai", "app", "dev", "info", "biz", "uk", "ca", "au",
+                  "de", "fr", "es", "nl", "se", "fi", "dk", "ie", "jp",
+                  "cn", "ru", "br", "mx", "nz", "za", "ch", "pl", "pt",
+                  "tv", "ac"))
+# Multi-label public suffixes, used to continue a domain past its first TLD
+PUBLIC_SUFFIXES = frozenset(("co.uk", "org.uk", "ac.uk", "gov.uk", "com.au",
+                             "net.au", "org.au", "co.nz", "co.jp", "co.in",
+                             "com.br", "co.za", "com.mx", "com.cn"))
+
+
+def normalize_spoken_email(text: str, at_words: FrozenSet[str] = AT_WORDS,
+                           symbols: Dict[str, str] = None) -> Optional[str]:
+    """
+    Build an email address from its spoken form in a single pass, i.e.
+    "john dot doe at example dot co dot uk" -> "john.doe@example.co.uk".
+    Words in the local part and first domain label are joined and anything
+    after the end of the domain is ignored.
+    @param text: spoken email address
+    @param at_words: spoken words for "@"
+    @param symbols: spoken words for address characters, default
+        SPOKEN_SYMBOLS
+    @return: email address, or None if `text` has no "at" or "@"
+    """
+    symbols = symbols or SPOKEN_SYMBOLS
+    local = ""
+    labels = None
+    after_dot = False
+    for token in text.lower().split():
+        token = token.strip(",.!?")
+        if not token:
+            continue
+        if labels is None:
+            if token in at_words and local:
+                labels = [""]
+            elif "@" in token:
+                prefix, domain = token.split("@", 1)
+                local += prefix
+                labels = domain.split(".") if domain else [""]
+                after_dot = len(labels) > 1
+            else:
+                local += symbols.get(token) or \
+                    SPOKEN_DIGITS.get(token, token)
+            continue
+        symbol = symbols.get(token)
+        if symbol == ".":
+            labels.append("")
+            after_dot = True
+        elif symbol:
+            labels[-1] += symbol
+        elif not labels[-1]:
+            labels[-1] = SPOKEN_DIGITS.get(token, token)
+        elif token in TLDS and (len(labels) == 1 or
+                                f"{labels[-1]}.{token}" in PUBLIC_SUFFIXES):
+            # Dot omitted before a TLD
+            labels.append(token)
+            after_dot = True
+        elif after_dot:
+            # Domain is complete; ignore trailing words
+            break
+        else:
+            labels[-1] += SPOKEN_DIGITS.get(token, token)
+    if labels is None:
+        return None
+    labels = [label for label in labels if label]
+    if not local or not labels:
+        return None
+    return f"{local}@{'.'.join(labels)}"
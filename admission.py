@@ -0,0 +1,102 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+
+class AdmissionController:
+    """
+    Per-user token bucket rate limiter. Each user may make `burst` requests
+    at once, refilled at `rate` requests per second. Buckets idle for
+    `idle_seconds` are evicted, as are the least recently used buckets when
+    more than `max_users` are tracked.
+    """
+    def __init__(self, rate: float = 0.5, burst: int = 10,
+                 idle_seconds: float = 600, max_users: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.idle_seconds = idle_seconds
+        self.max_users = max_users
+        self.admitted = 0
+        self.rejected = 0
+        self.evicted = 0
+        # user -> [tokens, last update], ordered by last update
+        self._buckets = OrderedDict()
+        self._lock = Lock()
+
+    def admit(self, user: str) -> bool:
+        """
+        Take a token from a user's bucket if one is available
+        @param user: user making a request
+        @return: True if the request should be handled, False if rate limited
+        """
+        now = monotonic()
+        with self._lock:
+            self._evict(now)
+            bucket = self._buckets.get(user)
+            if bucket is None:
+                bucket = self._buckets[user] = [float(self.burst), now]
+            else:
+                bucket[0] = min(self.burst,
+                                bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                self._buckets.move_to_end(user)
+            if bucket[0] < 1:
+                self.rejected += 1
+                return False
+            bucket[0] -= 1
+            self.admitted += 1
+            return True
+
+    def _evict(self, now: float):
+        """
+        Remove idle buckets from the front of the LRU order. A bucket idle for
+        `idle_seconds` has refilled completely, so dropping it is lossless
+        when `idle_seconds >= burst / rate`.
+        """
+        cutoff = now - self.idle_seconds
+        while self._buckets:
+            user, (_, updated) = next(iter(self._buckets.items()))
+            if updated > cutoff and len(self._buckets) < self.max_users:
+                break
+            self._buckets.popitem(last=False)
+            self.evicted += 1
+
+    def stats(self) -> dict:
+        """
+        Get current size and admission counters
+        """
+        return {"users": len(self._buckets),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "evicted": self.evicted}
+
+    def __len__(self):
+        return len(self._buckets)
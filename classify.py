@@ -0,0 +1,103 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from functools import lru_cache
+from typing import NamedTuple
+
+# Recipient kinds
+NUMBER = "number"
+NAME = "name"
+EMAIL = "email"
+MIXED = "mixed"
+
+
+class _CharTable(dict):
+    """
+    `str.translate` table that computes and caches the mapping of each code
+    point on first use, so any script's letters and digits are handled
+    without enumerating them up front.
+    """
+    def __init__(self, classify):
+        dict.__init__(self)
+        self._classify = classify
+
+    def __missing__(self, code: int):
+        self[code] = self._classify(chr(code))
+        return self[code]
+
+
+def _char_class(char: str):
+    if char.isdigit():
+        return char
+    if char.isalpha():
+        return "a"
+    if char == "@":
+        return char
+    return None
+
+
+# Keeps digits and "@", maps letters to "a" and drops everything else
+_CLASSES = _CharTable(_char_class)
+# Keeps only digits
+_DIGITS = _CharTable(lambda char: char if char.isdigit() else None)
+# Removes class markers from a translated string, leaving its digits
+_MARKERS = str.maketrans("", "", "a@")
+
+
+class RecipientClass(NamedTuple):
+    kind: str
+    digits: str
+
+
+@lru_cache(maxsize=1024)
+def classify_recipient(raw: str) -> RecipientClass:
+    """
+    Classify a recipient as a number, name, email address or a mix of a name
+    and number, translating the string once
+    @param raw: recipient string
+    @return: RecipientClass with the kind of recipient and its digits
+    """
+    classes = raw.translate(_CLASSES)
+    digits = classes.translate(_MARKERS)
+    if "@" in classes:
+        kind = EMAIL
+    elif "a" in classes:
+        kind = MIXED if digits else NAME
+    else:
+        kind = NUMBER if digits else NAME
+    return RecipientClass(kind, digits)
+
+
+@lru_cache(maxsize=1024)
+def extract_digits(raw: str) -> str:
+    """
+    Get only the digits in a string
+    @param raw: string to extract digits from
+    @return: string of digits in `raw`
+    """
+    return raw.translate(_DIGITS)
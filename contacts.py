@@ -0,0 +1,132 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import OrderedDict
+from difflib import get_close_matches
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, NamedTuple, Optional
+
+# Contact phone number fields in priority order
+PHONE_FIELDS = ("mobile", "work mobile", "home", "work", "other", "phone")
+
+
+class Contact(NamedTuple):
+    name: str
+    phone: Optional[str]
+    email: Optional[str]
+    data: dict
+
+    @classmethod
+    def from_contact_data(cls, name: str, data: dict):
+        """
+        Build a Contact from one entry of mobile `contact_data`
+        @param name: contact name
+        @param data: dict of contact field to address
+        @return: Contact with best phone number and email precomputed
+        """
+        phone = next((data[field] for field in PHONE_FIELDS
+                      if field in data), None)
+        return cls(name, phone, data.get("email"), data)
+
+
+class ContactIndex:
+    """
+    Per-user cache of contacts returned by the mobile client, indexed by
+    lowercase name, first name and any spoken names they were resolved from.
+    A user's contacts are invalidated `ttl` seconds after they were updated.
+    """
+    def __init__(self, max_users: int = 1000, ttl: float = 3600,
+                 cutoff: float = 0.8):
+        self.max_users = max_users
+        self.ttl = ttl
+        self.cutoff = cutoff
+        self._users = OrderedDict()
+        self._lock = Lock()
+
+    def update(self, user: str, contact_data: Dict[str, dict],
+               spoken_name: Optional[str] = None) -> List[Contact]:
+        """
+        Add contacts returned by the mobile client to a user's index
+        @param user: user the contacts belong to
+        @param contact_data: dict of contact name to contact fields
+        @param spoken_name: name the user requested these contacts with
+        @return: list of Contacts, best match to `spoken_name` first
+        """
+        contacts = [Contact.from_contact_data(name, data)
+                    for name, data in contact_data.items()]
+        if spoken_name and len(contacts) > 1:
+            names = {c.name.lower(): c for c in contacts}
+            best = get_close_matches(spoken_name.lower(), names, n=1,
+                                     cutoff=0)
+            contacts.sort(key=lambda c: c is not names[best[0]])
+        with self._lock:
+            updated, index = self._users.pop(user, (None, {}))
+            for contact in reversed(contacts):
+                index[contact.name.lower()] = contact
+                index.setdefault(contact.name.split()[0].lower(), contact)
+            if spoken_name and contacts:
+                index[spoken_name.lower()] = contacts[0]
+            while len(self._users) >= self.max_users:
+                self._users.popitem(last=False)
+            self._users[user] = (monotonic(), index)
+        return contacts
+
+    def lookup(self, user: str, name: str) -> Optional[Contact]:
+        """
+        Find a cached contact for a user by exact or approximate name
+        @param user: user to look up a contact for
+        @param name: contact name to look up
+        @return: matched Contact, else None
+        """
+        if not name:
+            return None
+        with self._lock:
+            entry = self._users.get(user)
+            if not entry:
+                return None
+            if monotonic() - entry[0] > self.ttl:
+                self._users.pop(user)
+                return None
+            index = entry[1]
+        name = name.lower().strip()
+        if name in index:
+            return index[name]
+        match = get_close_matches(name, index, n=1, cutoff=self.cutoff)
+        return index[match[0]] if match else None
+
+    def invalidate(self, user: Optional[str] = None):
+        """
+        Remove cached contacts for one user, or for all users
+        @param user: user to invalidate contacts for, None for all users
+        """
+        with self._lock:
+            if user is None:
+                self._users.clear()
+            else:
+                self._users.pop(user, None)
@@ -0,0 +1,127 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from collections import deque
+from random import choice, randrange
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ovos_utils.bracket_expansion import expand_options
+
+SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# As in MustacheDialogRenderer, up to this many recently spoken lines of a
+# dialog are avoided, leaving at least `LOOP_PREVENTION_OFFSET` lines to pick
+MAX_RECENT_PHRASES = 3
+LOOP_PREVENTION_OFFSET = 2
+
+
+class DialogTemplate:
+    """
+    One line of a dialog file with its `(a|b)` options expanded and each
+    option pre-split into literal text and slot names
+    """
+    __slots__ = ("options",)
+
+    def __init__(self, template: str):
+        # Even indices are literal text and odd indices are slot names
+        self.options = [SLOT_PATTERN.split(option)
+                        for option in expand_options(template)]
+
+    def render(self, data: dict) -> str:
+        parts = choice(self.options)[:]
+        for idx in range(1, len(parts), 2):
+            parts[idx] = str(data.get(parts[idx], ""))
+        return "".join(parts)
+
+
+class DialogCache:
+    """
+    Per-language cache of parsed dialog templates. Prompts are rendered like
+    MustacheDialogRenderer does, picking a line that was not spoken recently
+    and one of its `(a|b)` options, but options are expanded when a dialog is
+    loaded instead of on every render.
+    """
+    def __init__(self, find_dialog: Callable[[str, str], Optional[str]]):
+        """
+        @param find_dialog: callable returning the path to a named dialog
+            file for a language, or None if it does not exist
+        """
+        self._find_dialog = find_dialog
+        self._templates: Dict[str, Dict[str, Tuple[List[DialogTemplate],
+                                                   deque]]] = {}
+
+    def warm(self, lang: str, names: Iterable[str]):
+        """
+        Load and parse dialogs for a language
+        @param lang: language to load dialogs for
+        @param names: names of dialogs to load
+        """
+        for name in names:
+            self._load(lang, name)
+
+    def render(self, name: str, lang: str,
+               data: Optional[dict] = None) -> Optional[str]:
+        """
+        Render a random line of a dialog that was not rendered recently
+        @param name: name of the dialog to render
+        @param lang: language to render the dialog in
+        @param data: slot values to substitute
+        @return: rendered dialog, or None if the dialog was not found
+        """
+        dialog = self._templates.get(lang, {}).get(name)
+        if dialog is None:
+            dialog = self._load(lang, name)
+        templates, recent = dialog
+        if not templates:
+            return None
+        if recent:
+            idx = choice([idx for idx in range(len(templates))
+                          if idx not in recent])
+        else:
+            idx = randrange(len(templates))
+        if recent.maxlen:
+            recent.append(idx)
+        return templates[idx].render(data or {})
+
+    def _load(self, lang: str, name: str) -> Tuple[List[DialogTemplate],
+                                                   deque]:
+        path = self._find_dialog(name, lang)
+        templates = []
+        if path:
+            with open(path, encoding="utf-8") as f:
+                templates = [DialogTemplate(line.strip()) for line in f
+                             if line.strip() and
+                             not line.strip().startswith("#")]
+        # Indices of recently rendered lines, to avoid repeating them
+        recent = deque(maxlen=max(0, min(
+            MAX_RECENT_PHRASES, len(templates) - LOOP_PREVENTION_OFFSET)))
+        dialog = self._templates.setdefault(lang, {})[name] = \
+            (templates, recent)
+        return dialog
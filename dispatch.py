@@ -0,0 +1,189 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Hashable, Optional
+from uuid import uuid4
+
+from ovos_utils.log import LOG
+
+from .lookups import TimerWheel
+
+# Actions that are safe to re-send to a client that has never acknowledged a
+# request. Re-sending any other action may, i.e., place a call twice.
+IDEMPOTENT_ACTIONS = frozenset({"get_contact"})
+
+
+class _PendingRequest:
+    __slots__ = ("request", "client", "expect_ack", "retries", "delay")
+
+    def __init__(self, request, client: Hashable, expect_ack: bool,
+                 retries: int, delay: float):
+        self.request = request
+        self.client = client
+        # False if the client is not known to acknowledge this request
+        self.expect_ack = expect_ack
+        self.retries = retries
+        self.delay = delay
+
+
+class MobileDispatcher:
+    """
+    Sends requests to the mobile client on a bounded worker pool so the bus
+    thread is never blocked. Acknowledgment timeouts run on a timer wheel,
+    so unacknowledged requests do not hold a worker. A request that is not
+    acknowledged is re-sent with exponential backoff until retries are
+    exhausted; requests that are not idempotent are only re-sent to clients
+    that have acknowledged a request before.
+    """
+    def __init__(self, emit: Callable, max_workers: int = 4,
+                 max_pending: int = 1000, ack_timeout: float = 10,
+                 retries: int = 2, backoff: float = 1.0,
+                 client_key: Callable = None, tick: float = 0.5):
+        """
+        @param emit: callable used to emit a Message (i.e. `bus.emit`)
+        @param max_workers: max number of threads emitting requests
+        @param max_pending: max number of unacknowledged requests
+        @param ack_timeout: seconds to wait for an acknowledgment
+        @param retries: number of times to re-send an unacknowledged request
+        @param backoff: seconds to wait before the first retry, doubling
+            after each retry
+        @param client_key: callable returning the client a Message is routed
+            to (i.e. `get_message_user`), default all requests share a client
+        @param tick: resolution of timeouts in seconds
+        """
+        self.emit = emit
+        self.max_pending = max_pending
+        self.ack_timeout = ack_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = {"sent": 0, "acked": 0, "retried": 0, "failed": 0,
+                      "unconfirmed": 0, "cancelled": 0, "rejected": 0}
+        self._client_key = client_key or (lambda message: None)
+        # Clients that have acknowledged at least one request
+        self._acking_clients = set()
+        self._pending = {}
+        self._lock = Lock()
+        self._timers = TimerWheel(tick)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="messaging")
+
+    def send(self, message, action: str, data: dict,
+             request_id: str = None) -> Optional[str]:
+        """
+        Queue a request to the mobile client
+        @param message: Message associated with the request, used for routing
+        @param action: mobile action to request (i.e. "sms", "call", "email")
+        @param data: request data
+        @param request_id: ID to send the request with, default a new UUID
+        @return: request ID if queued, else None
+        """
+        request_id = request_id or str(uuid4())
+        client = self._client_key(message)
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.stats["rejected"] += 1
+                LOG.error(f"Dispatch queue full, dropping {action} request")
+                return None
+            expect_ack = action in IDEMPOTENT_ACTIONS or \
+                client in self._acking_clients
+            self._pending[request_id] = _PendingRequest(
+                message.forward(f"neon.messaging.mobile.{action}",
+                                {**data, "request_id": request_id}),
+                client, expect_ack, self.retries if expect_ack else 0,
+                self.backoff)
+        self._executor.submit(self._dispatch, request_id)
+        return request_id
+
+    def handle_ack(self, request_id: str):
+        """
+        Mark a request as acknowledged by the mobile client
+        @param request_id: ID of the acknowledged request
+        """
+        with self._lock:
+            pending = self._pending.pop(request_id, None)
+            if pending is None:
+                return
+            self._acking_clients.add(pending.client)
+            self.stats["acked"] += 1
+        self._timers.cancel(request_id)
+
+    def cancel(self, request_id: str):
+        """
+        Stop re-sending a request whose response is no longer needed
+        @param request_id: ID of the request to cancel
+        """
+        with self._lock:
+            if self._pending.pop(request_id, None) is None:
+                return
+            self.stats["cancelled"] += 1
+        self._timers.cancel(request_id)
+
+    def shutdown(self):
+        """
+        Stop retrying pending requests and stop worker threads
+        """
+        self._timers.shutdown()
+        self._executor.shutdown(wait=False)
+
+    def _dispatch(self, request_id: str):
+        with self._lock:
+            pending = self._pending.get(request_id)
+        if pending is None:
+            return
+        try:
+            self.emit(pending.request)
+        except Exception as e:
+            LOG.exception(e)
+        self.stats["sent"] += 1
+        self._timers.schedule(request_id, self.ack_timeout,
+                              lambda: self._handle_timeout(request_id))
+
+    def _handle_timeout(self, request_id: str):
+        with self._lock:
+            pending = self._pending.get(request_id)
+            if pending is None:
+                return
+            if pending.retries:
+                pending.retries -= 1
+                delay = pending.delay
+                pending.delay *= 2
+                self.stats["retried"] += 1
+            else:
+                del self._pending[request_id]
+                if pending.expect_ack:
+                    self.stats["failed"] += 1
+                    LOG.warning(f"No acknowledgment for "
+                                f"{pending.request.msg_type} ({request_id})")
+                else:
+                    self.stats["unconfirmed"] += 1
+                return
+        self._timers.schedule(request_id, delay,
+                              lambda: self._executor.submit(self._dispatch,
+                                                            request_id))
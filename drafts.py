@@ -0,0 +1,464 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import zlib
+
+from collections import OrderedDict
+from tempfile import TemporaryFile
+from threading import Lock
+from time import monotonic, time
+from typing import Optional
+
+from ovos_utils.log import LOG
+
+from .classify import RecipientClass, classify_recipient
+
+
+class DraftStore:
+    """
+    Bounded store of in-progress drafts keyed by user. Drafts expire `ttl`
+    seconds after they were last accessed and the least recently used draft
+    is evicted when `max_size` drafts are stored. If a `journal` is set,
+    changes are recorded to it and drafts missing from memory are restored
+    from it on first access.
+    """
+    def __init__(self, max_size: int = 1000, ttl: float = 900):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.journal = None
+        self.expired = 0
+        self.evicted = 0
+        self.restored = 0
+        self._drafts = OrderedDict()
+        self._lock = Lock()
+
+    def expire(self):
+        """
+        Remove all drafts that have not been accessed within `ttl` seconds.
+        """
+        cutoff = monotonic() - self.ttl
+        with self._lock:
+            while self._drafts:
+                user, (accessed, _) = next(iter(self._drafts.items()))
+                if accessed > cutoff:
+                    break
+                self._drafts.popitem(last=False)
+                self.expired += 1
+                if self.journal:
+                    self.journal.remove(user)
+
+    def get(self, user: str, default=None):
+        """
+        Get the draft for a user, refreshing its access time
+        @param user: user to get a draft for
+        @param default: value to return if the user has no active draft
+        @return: draft if it exists and has not expired, else `default`
+        """
+        with self._lock:
+            entry = self._drafts.get(user)
+            if entry is None:
+                if self.journal and user in self.journal:
+                    entry = self._restore(user)
+                if entry is None:
+                    return default
+            now = monotonic()
+            if now - entry[0] > self.ttl:
+                self._drafts.pop(user)
+                self.expired += 1
+                if self.journal:
+                    self.journal.remove(user)
+                return default
+            self._drafts[user] = (now, entry[1])
+            self._drafts.move_to_end(user)
+            return entry[1]
+
+    def pop(self, user: str, default=None):
+        with self._lock:
+            entry = self._drafts.pop(user, None)
+        if self.journal:
+            self.journal.remove(user)
+        return default if entry is None else entry[1]
+
+    def save(self, user: str):
+        """
+        Record changes made to a user's draft in place
+        @param user: user whose draft was changed
+        """
+        if self.journal:
+            entry = self._drafts.get(user)
+            if entry:
+                self.journal.record(user, entry[1])
+
+    def stats(self) -> dict:
+        """
+        Get current size and eviction counters for this store
+        """
+        return {"size": len(self._drafts),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "restored": self.restored}
+
+    def __setitem__(self, user: str, draft):
+        self.expire()
+        with self._lock:
+            self._drafts.pop(user, None)
+            while len(self._drafts) >= self.max_size:
+                evicted, _ = self._drafts.popitem(last=False)
+                self.evicted += 1
+                if self.journal:
+                    self.journal.remove(evicted)
+            self._drafts[user] = (monotonic(), draft)
+        if self.journal:
+            self.journal.record(user, draft)
+
+    def __getitem__(self, user: str):
+        draft = self.get(user)
+        if draft is None:
+            raise KeyError(user)
+        return draft
+
+    def __contains__(self, user: Optional[str]) -> bool:
+        return self.get(user) is not None
+
+    def __len__(self) -> int:
+        return len(self._drafts)
+
+    def _restore(self, user: str) -> Optional[tuple]:
+        """
+        Restore a user's draft from the journal. Must be called with the
+        lock held.
+        """
+        journaled = self.journal.load(user)
+        if not journaled:
+            return None
+        updated, data = journaled
+        try:
+            draft = draft_from_dict(data)
+        except (KeyError, TypeError) as e:
+            LOG.error(f"Invalid journaled draft for {user}: {e}")
+            self.journal.remove(user)
+            return None
+        # Keep the time since the draft was last updated before the restart
+        entry = (monotonic() - (time() - updated), draft)
+        self._drafts[user] = entry
+        self.restored += 1
+        return entry
+
+
+def shard_index(user: Optional[str], shards: int) -> int:
+    """
+    Get the shard a user's drafts belong to. Unlike `hash`, this is stable
+    across processes so separate skill workers agree on ownership.
+    @param user: user to get the shard for
+    @param shards: total number of shards
+    @return: shard index in range(shards)
+    """
+    return zlib.crc32(str(user).encode("utf-8")) % shards
+
+
+class ShardedDraftStore:
+    """
+    Draft backend with the same interface as DraftStore that partitions
+    users by hash across independent DraftStores, so lookups for different
+    users do not contend for one lock.
+    """
+    def __init__(self, shards: int = 4, max_size: int = 1000,
+                 ttl: float = 900):
+        """
+        @param shards: number of DraftStores to partition users across
+        @param max_size: max number of drafts across all shards
+        @param ttl: seconds after last access that a draft expires
+        """
+        self._shards = [DraftStore(max(1, max_size // shards), ttl)
+                        for _ in range(shards)]
+
+    def _shard(self, user: Optional[str]) -> DraftStore:
+        return self._shards[shard_index(user, len(self._shards))]
+
+    @property
+    def journal(self):
+        return self._shards[0].journal
+
+    @journal.setter
+    def journal(self, journal):
+        for shard in self._shards:
+            shard.journal = journal
+
+    @property
+    def ttl(self) -> float:
+        return self._shards[0].ttl
+
+    @ttl.setter
+    def ttl(self, ttl: float):
+        for shard in self._shards:
+            shard.ttl = ttl
+
+    def expire(self):
+        for shard in self._shards:
+            shard.expire()
+
+    def get(self, user: str, default=None):
+        return self._shard(user).get(user, default)
+
+    def pop(self, user: str, default=None):
+        return self._shard(user).pop(user, default)
+
+    def save(self, user: str):
+        self._shard(user).save(user)
+
+    def stats(self) -> dict:
+        stats = {"shards": len(self._shards)}
+        for shard in self._shards:
+            for key, value in shard.stats().items():
+                if key != "ttl":
+                    stats[key] = stats.get(key, 0) + value
+        stats["ttl"] = self.ttl
+        return stats
+
+    def __setitem__(self, user: str, draft):
+        self._shard(user)[user] = draft
+
+    def __getitem__(self, user: str):
+        return self._shard(user)[user]
+
+    def __contains__(self, user: Optional[str]) -> bool:
+        return user in self._shard(user)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class BodyBuffer:
+    """
+    Append-only email body that keeps dictated lines as a list of chunks
+    instead of one growing string, with running word and character counts.
+    Bodies over `spill_chars` are moved to a temporary file and appends that
+    would exceed `max_chars` are rejected. Reads may happen on another
+    thread, i.e. when the draft is journaled.
+    """
+    __slots__ = ("max_chars", "spill_chars", "chars", "words", "_chunks",
+                 "_file", "_lock")
+
+    def __init__(self, text: str = "", max_chars: int = 50000,
+                 spill_chars: int = 8192):
+        self.max_chars = max_chars
+        self.spill_chars = spill_chars
+        self.chars = 0
+        self.words = 0
+        self._chunks = []
+        self._file = None
+        self._lock = Lock()
+        if text:
+            self._write(text)
+
+    def append(self, line: str) -> bool:
+        """
+        Add a line to the body
+        @param line: line of text to add
+        @return: False if the line was rejected because the body is full
+        """
+        if self.chars + len(line) + 1 > self.max_chars:
+            return False
+        self._write(line + "\n")
+        return True
+
+    def getvalue(self) -> str:
+        """
+        Get the complete body text
+        """
+        with self._lock:
+            if not self._file:
+                return "".join(self._chunks)
+            self._file.seek(0)
+            text = self._file.read()
+            self._file.seek(0, 2)
+            return text
+
+    def close(self):
+        """
+        Remove any temporary file backing this body
+        """
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _write(self, text: str):
+        with self._lock:
+            self.chars += len(text)
+            self.words += len(text.split())
+            if self._file:
+                self._file.write(text)
+                return
+            self._chunks.append(text)
+            if self.chars > self.spill_chars:
+                self._file = TemporaryFile("w+", encoding="utf-8")
+                self._file.writelines(self._chunks)
+                self._chunks = []
+
+    def __str__(self):
+        return self.getvalue()
+
+    def __repr__(self):
+        return f"BodyBuffer(chars={self.chars}, words={self.words})"
+
+
+class Draft:
+    """
+    Base class for an in-progress message draft. Only the parts of the
+    originating message context needed to respond are retained.
+    """
+    __slots__ = ("recipient", "name", "next_input", "klat_data",
+                 "_recipient_class")
+    kind = None
+    # Spoken name of the address type this draft is sent to
+    address_type = "contact info"
+    # Contact attribute this draft is addressed with
+    contact_address = None
+
+    def __init__(self, recipient: str = "", next_input: str = "recipient",
+                 klat_data: Optional[dict] = None, name: Optional[str] = None):
+        self.recipient = recipient
+        # Contact name of the recipient, once resolved
+        self.name = name
+        # (recipient, RecipientClass) for the last classified recipient
+        self._recipient_class = None
+        self.next_input = next_input
+        self.klat_data = klat_data
+
+    @property
+    def recipient_class(self) -> RecipientClass:
+        """
+        Classification of the current recipient, computed once per recipient
+        """
+        if self._recipient_class is None or \
+                self._recipient_class[0] != self.recipient:
+            self._recipient_class = (self.recipient,
+                                     classify_recipient(self.recipient))
+        return self._recipient_class[1]
+
+    def to_dict(self) -> dict:
+        """
+        Serialize this draft
+        """
+        data = {slot: getattr(self, slot, None)
+                for cls in type(self).__mro__
+                for slot in getattr(cls, "__slots__", ())
+                if not slot.startswith("_")}
+        data["kind"] = self.kind
+        return data
+
+    def __repr__(self):
+        fields = ", ".join(f"{slot}={getattr(self, slot, None)!r}"
+                           for cls in reversed(type(self).__mro__)
+                           for slot in getattr(cls, "__slots__", ())
+                           if slot != "klat_data" and
+                           not slot.startswith("_"))
+        return f"{type(self).__name__}({fields})"
+
+
+class EmailDraft(Draft):
+    __slots__ = ("subject", "body")
+    kind = "email"
+    address_type = "email address"
+    contact_address = "email"
+
+    def __init__(self, recipient: str = "", subject: str = "",
+                 body: str = "", **kwargs):
+        Draft.__init__(self, recipient, **kwargs)
+        self.subject = subject
+        self.body = BodyBuffer(body)
+
+    def to_dict(self) -> dict:
+        data = Draft.to_dict(self)
+        data["body"] = self.body.getvalue()
+        return data
+
+
+class SmsDraft(Draft):
+    __slots__ = ("message", "number")
+    kind = "text message"
+    address_type = "phone number"
+    contact_address = "phone"
+
+    def __init__(self, recipient: str = "", message: str = "",
+                 number: Optional[str] = None, **kwargs):
+        Draft.__init__(self, recipient, **kwargs)
+        self.message = message
+        self.number = number
+
+
+class CallDraft(Draft):
+    __slots__ = ("number",)
+    kind = "call"
+    contact_address = "phone"
+
+    def __init__(self, recipient: str = "", number: Optional[str] = None,
+                 name: Optional[str] = None, **kwargs):
+        Draft.__init__(self, recipient, name=name, **kwargs)
+        self.number = number
+
+
+def draft_from_dict(data: dict) -> Draft:
+    """
+    Build a Draft from the output of `Draft.to_dict`
+    """
+    data = dict(data)
+    cls = {EmailDraft.kind: EmailDraft, SmsDraft.kind: SmsDraft,
+           CallDraft.kind: CallDraft}[data.pop("kind")]
+    return cls(**data)
+
+
+# Input classes recognized in a draft state, checked in order. Each is the
+# name of a vocab file; input matching none of them is classified as `TEXT`
+TEXT = "text"
+DRAFT_INPUTS = {
+    (EmailDraft.kind, "body"): ("done",),
+    (EmailDraft.kind, "confirmation"): ("no", "yes"),
+    (SmsDraft.kind, "confirmation"): ("no", "yes"),
+    (CallDraft.kind, "confirmation"): ("no", "yes"),
+}
+
+# (kind, state, input class) -> (action, next state). Inputs without a
+# transition are not handled by the skill
+DRAFT_TRANSITIONS = {
+    (EmailDraft.kind, "recipient", TEXT): ("set_email_recipient", "subject"),
+    (EmailDraft.kind, "subject", TEXT): ("set_subject", "body"),
+    (EmailDraft.kind, "body", TEXT): ("append_body", "body"),
+    (EmailDraft.kind, "body", "done"): ("finish_email", "confirmation"),
+    (EmailDraft.kind, "confirmation", "no"): ("discard", None),
+    (EmailDraft.kind, "confirmation", "yes"): ("send_email", None),
+    (SmsDraft.kind, "recipient", TEXT): ("set_recipient", "message"),
+    (SmsDraft.kind, "message", TEXT): ("set_message", "confirmation"),
+    (SmsDraft.kind, "confirmation", "no"): ("discard", None),
+    (SmsDraft.kind, "confirmation", "yes"): ("send_sms", None),
+    (CallDraft.kind, "confirmation", "no"): ("discard", None),
+    (CallDraft.kind, "confirmation", "yes"): ("place_call", None),
+}
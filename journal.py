@@ -0,0 +1,169 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import sqlite3
+
+from threading import Event, Lock, Thread
+from time import time
+from typing import Optional, Tuple
+
+from ovos_utils.log import LOG
+
+
+class DraftJournal:
+    """
+    Crash-safe record of the latest state of each user's draft in a SQLite
+    database in WAL mode. Changes are coalesced per user and written in one
+    transaction every `flush_interval` seconds, so the database holds a
+    compact snapshot that is read back one user at a time after a restart.
+    Other per-user state with a `to_dict` method, or a snapshot of it as a
+    dict, may be journaled the same way in its own `table`.
+    """
+    def __init__(self, path: str, flush_interval: float = 1.0,
+                 table: str = "drafts"):
+        """
+        @param path: path to the SQLite database file
+        @param flush_interval: seconds between writes of pending changes
+        @param table: name of the table to store records in
+        """
+        self.flush_interval = flush_interval
+        self._table = table
+        self._conn = sqlite3.connect(path, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                           "(user TEXT PRIMARY KEY, updated REAL, draft TEXT)")
+        self._users = {row[0] for row in
+                       self._conn.execute(f"SELECT user FROM {table}")}
+        self._pending = {}
+        self._lock = Lock()
+        self._stopping = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def prune(self, max_age: float):
+        """
+        Remove journaled drafts not updated within `max_age` seconds
+        """
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self._table} "
+                               "WHERE updated < ?", (time() - max_age,))
+            self._users = {row[0] for row in self._conn.execute(
+                f"SELECT user FROM {self._table}")}
+
+    def record(self, user: str, draft):
+        """
+        Queue the current state of a user's draft to be written
+        @param user: user the draft belongs to
+        @param draft: Draft to record; it is serialized when written. A
+            dict is recorded as already serialized
+        """
+        with self._lock:
+            self._pending[user] = (time(), draft)
+            self._users.add(user)
+
+    def remove(self, user: str):
+        """
+        Queue removal of a user's draft
+        """
+        with self._lock:
+            if user in self._users:
+                self._pending[user] = None
+                self._users.discard(user)
+
+    def load(self, user: str) -> Optional[Tuple[float, dict]]:
+        """
+        Read a user's journaled draft
+        @param user: user to read a draft for
+        @return: (update timestamp, serialized draft) if one exists
+        """
+        with self._lock:
+            if user not in self._users:
+                return None
+            pending = self._pending.get(user)
+            if pending:
+                return pending[0], _serialize(pending[1])
+            row = self._conn.execute(f"SELECT updated, draft FROM "
+                                     f"{self._table} WHERE user = ?",
+                                     (user,)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def flush(self):
+        """
+        Write all pending changes in a single transaction
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            updates = []
+            for user, entry in pending.items():
+                if not entry:
+                    continue
+                try:
+                    updates.append((user, entry[0],
+                                    json.dumps(_serialize(entry[1]))))
+                except Exception as e:
+                    LOG.error(f"Failed to serialize {self._table} entry "
+                              f"for {user}: {e}")
+            removals = [(user,) for user, entry in pending.items()
+                        if not entry]
+            try:
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    self._conn.executemany(f"INSERT OR REPLACE INTO "
+                                           f"{self._table} VALUES (?, ?, ?)",
+                                           updates)
+                    self._conn.executemany(f"DELETE FROM {self._table} "
+                                           "WHERE user = ?", removals)
+            except sqlite3.Error as e:
+                LOG.error(f"Failed to write {self._table} journal: {e}")
+
+    def close(self):
+        """
+        Write pending changes and close the database
+        """
+        self._stopping.set()
+        self._thread.join()
+        self.flush()
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
+
+    def __contains__(self, user: Optional[str]) -> bool:
+        return user in self._users
+
+    def _run(self):
+        while not self._stopping.wait(self.flush_interval):
+            self.flush()
+
+
+def _serialize(draft) -> dict:
+    return draft if isinstance(draft, dict) else draft.to_dict()
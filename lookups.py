@@ -0,0 +1,247 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from math import ceil
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Callable, Hashable, List, Optional
+
+from ovos_utils.log import LOG
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel running every scheduled callback on one background
+    thread. Timeouts are rounded up to a multiple of `tick` seconds;
+    scheduling and cancelling are O(1).
+    """
+    def __init__(self, tick: float = 0.5, slots: int = 64):
+        self.tick = tick
+        self._slots = [{} for _ in range(slots)]
+        # key -> slot index
+        self._index = {}
+        self._cursor = 0
+        self._lock = Lock()
+        self._stopping = Event()
+        self._thread = None
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable):
+        """
+        Call `callback` after `delay` seconds unless cancelled first
+        @param key: unique key used to cancel the timer
+        @param delay: seconds to wait before calling `callback`
+        @param callback: function to call with no arguments
+        """
+        ticks = max(1, ceil(delay / self.tick))
+        with self._lock:
+            self._cancel(key)
+            slot = (self._cursor + ticks) % len(self._slots)
+            rounds = (ticks - 1) // len(self._slots)
+            self._slots[slot][key] = [rounds, callback]
+            self._index[key] = slot
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True,
+                                      name="messaging-timers")
+                self._thread.start()
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Cancel a scheduled callback
+        @param key: key the callback was scheduled with
+        @return: True if a pending callback was cancelled
+        """
+        with self._lock:
+            return self._cancel(key)
+
+    def shutdown(self):
+        """
+        Stop the timer thread without calling pending callbacks
+        """
+        self._stopping.set()
+
+    def _cancel(self, key: Hashable) -> bool:
+        slot = self._index.pop(key, None)
+        if slot is None:
+            return False
+        self._slots[slot].pop(key, None)
+        return True
+
+    def _run(self):
+        next_tick = monotonic() + self.tick
+        while not self._stopping.wait(max(0.0, next_tick - monotonic())):
+            next_tick += self.tick
+            expired = []
+            with self._lock:
+                self._cursor = (self._cursor + 1) % len(self._slots)
+                slot = self._slots[self._cursor]
+                for key, timer in list(slot.items()):
+                    if timer[0]:
+                        timer[0] -= 1
+                        continue
+                    del slot[key]
+                    del self._index[key]
+                    expired.append(timer[1])
+            for callback in expired:
+                try:
+                    callback()
+                except Exception as e:
+                    LOG.exception(e)
+
+
+class PendingLookup:
+    """
+    Contact lookup sent to the mobile client and awaiting a reply
+    """
+    __slots__ = ("request_id", "user", "recipient", "draft", "message")
+
+    def __init__(self, request_id: str, user: str, recipient: str, draft,
+                 message):
+        self.request_id = request_id
+        self.user = user
+        self.recipient = recipient
+        self.draft = draft
+        self.message = message
+
+    def is_current(self, draft) -> bool:
+        """
+        Check if this lookup is still for a draft's current recipient
+        @param draft: the user's current draft, if any
+        @return: False if the draft was replaced or its recipient changed
+        """
+        return draft is self.draft and draft.recipient == self.recipient
+
+
+class ContactLookupTracker:
+    """
+    Correlates contact lookups with replies from the mobile client by request
+    ID. Lookups that get no reply within `timeout` seconds are passed to
+    `on_timeout`; replies to unknown, resolved or timed out lookups are
+    discarded with a single dict lookup.
+    """
+    def __init__(self, on_timeout: Callable[[PendingLookup], None],
+                 timeout: float = 15, tick: float = 0.5):
+        """
+        @param on_timeout: called with each lookup that times out
+        @param timeout: seconds to wait for a reply
+        @param tick: resolution of timeouts in seconds
+        """
+        self.on_timeout = on_timeout
+        self.timeout = timeout
+        self.stats = {"started": 0, "resolved": 0, "timed_out": 0,
+                      "discarded": 0}
+        self._pending = {}
+        # user -> set of pending request IDs
+        self._users = {}
+        self._lock = Lock()
+        self._timers = TimerWheel(tick)
+
+    def start(self, request_id: str, user: str, draft, message):
+        """
+        Track a lookup that was sent to the mobile client
+        @param request_id: ID the reply will be correlated by
+        @param user: user the lookup is for
+        @param draft: Draft whose recipient is being looked up
+        @param message: Message associated with the request
+        """
+        lookup = PendingLookup(request_id, user, draft.recipient, draft,
+                               message)
+        with self._lock:
+            self._pending[request_id] = lookup
+            self._users.setdefault(user, set()).add(request_id)
+            self.stats["started"] += 1
+        self._timers.schedule(request_id, self.timeout,
+                              lambda: self._expire(request_id))
+
+    def get(self, request_id: str) -> Optional[PendingLookup]:
+        """
+        Get a pending lookup without resolving it
+        @param request_id: ID of the lookup
+        @return: PendingLookup if it is pending, else None
+        """
+        return self._pending.get(request_id)
+
+    def resolve(self, request_id: str) -> Optional[PendingLookup]:
+        """
+        Stop tracking a lookup that received a reply
+        @param request_id: ID of the reply
+        @return: PendingLookup if it was pending, else None
+        """
+        lookup = self._pop(request_id)
+        if lookup is None:
+            self.stats["discarded"] += 1
+            return None
+        self._timers.cancel(request_id)
+        self.stats["resolved"] += 1
+        return lookup
+
+    def cancel(self, user: str) -> List[str]:
+        """
+        Stop tracking all lookups for a user
+        @param user: user to cancel lookups for
+        @return: request IDs of the cancelled lookups
+        """
+        with self._lock:
+            request_ids = list(self._users.pop(user, ()))
+            for request_id in request_ids:
+                self._pending.pop(request_id, None)
+        for request_id in request_ids:
+            self._timers.cancel(request_id)
+        return request_ids
+
+    def pending(self, user: str) -> int:
+        """
+        Get the number of lookups in flight for a user
+        """
+        return len(self._users.get(user, ()))
+
+    def shutdown(self):
+        self._timers.shutdown()
+
+    def _pop(self, request_id: str) -> Optional[PendingLookup]:
+        with self._lock:
+            lookup = self._pending.pop(request_id, None)
+            if lookup is None:
+                return None
+            request_ids = self._users.get(lookup.user)
+            if request_ids is not None:
+                request_ids.discard(request_id)
+                if not request_ids:
+                    del self._users[lookup.user]
+        return lookup
+
+    def _expire(self, request_id: str):
+        lookup = self._pop(request_id)
+        if lookup is None:
+            return
+        self.stats["timed_out"] += 1
+        LOG.warning(f"Contact lookup timed out for {lookup.recipient} "
+                    f"({request_id})")
+        self.on_timeout(lookup)
+
+    def __len__(self):
+        return len(self._pending)
@@ -0,0 +1,138 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class MessageMatcher:
+    """
+    Classifies the kind of message requested in an utterance using a single
+    compiled pattern built from skill vocabulary. Matching ignores case, like
+    `voc_match`.
+    """
+    def __init__(self, vocab: Dict[str, List[str]]):
+        """
+        @param vocab: dict of message kind to vocab phrases, in priority order
+        """
+        self._priority = {kind: idx for idx, kind in enumerate(vocab)}
+        # Most words in any phrase
+        self.max_words = 1
+        groups = []
+        for kind, phrases in vocab.items():
+            phrases = sorted({p.strip() for p in phrases if p.strip()},
+                             key=len, reverse=True)
+            self.max_words = max([self.max_words] +
+                                 [len(p.split()) for p in phrases])
+            if phrases:
+                alternation = "|".join(re.escape(p) for p in phrases)
+                groups.append(f"(?P<{kind}>\\b(?:{alternation})\\b)")
+        self._pattern = re.compile("|".join(groups), re.IGNORECASE) \
+            if groups else None
+
+    def match_kind(self, utt: str) -> Optional[str]:
+        """
+        Find the highest priority message kind referenced in an utterance
+        @param utt: (str) user input
+        @return: (str?) matched kind
+        """
+        if not utt or not self._pattern:
+            return None
+        best = None
+        for match in self._pattern.finditer(utt):
+            kind = match.lastgroup
+            if best is None or self._priority[kind] < self._priority[best]:
+                best = kind
+                if self._priority[kind] == 0:
+                    break
+        return best
+
+    def priority(self, kind: str) -> int:
+        """
+        Get the priority of a message kind, lower values first
+        """
+        return self._priority[kind]
+
+    def scan(self, utt: str) -> Iterator[Tuple[int, str]]:
+        """
+        Find every message kind referenced in an utterance
+        @param utt: (str) user input
+        @return: iterator of (end offset, kind) for each match
+        """
+        if not utt or not self._pattern:
+            return iter(())
+        return ((match.end(), match.lastgroup)
+                for match in self._pattern.finditer(utt))
+
+
+class ConfirmationClassifier:
+    """
+    Classifies replies to a confirmation prompt by whole-word matching
+    against precomputed sets of vocab phrases.
+    """
+    def __init__(self, vocab: Dict[str, List[str]]):
+        """
+        @param vocab: dict of input class (i.e. "no", "yes") to vocab phrases
+        """
+        self._words = {}
+        self._phrases = {}
+        for input_class, phrases in vocab.items():
+            tokens = [self.tokenize(p) for p in phrases]
+            self._words[input_class] = frozenset(t[0] for t in tokens
+                                                 if len(t) == 1)
+            self._phrases[input_class] = tuple(tuple(t) for t in tokens
+                                               if len(t) > 1)
+
+    @staticmethod
+    def tokenize(utt: str) -> List[str]:
+        """
+        Split text into lowercase words, dropping apostrophes so "don't"
+        matches "dont"
+        """
+        return re.findall(r"\w+", utt.lower().replace("'", ""))
+
+    def classify(self, utt: str, input_classes: Tuple[str, ...]) -> Optional[str]:
+        """
+        Get the first of `input_classes` with a phrase in an utterance
+        @param utt: user reply
+        @param input_classes: input classes to check, in priority order
+        @return: (str?) matched input class
+        """
+        tokens = self.tokenize(utt)
+        token_set = set(tokens)
+        for input_class in input_classes:
+            if token_set & self._words.get(input_class, frozenset()):
+                return input_class
+            for phrase in self._phrases.get(input_class, ()):
+                if phrase[0] in token_set and any(
+                        tuple(tokens[idx:idx + len(phrase)]) == phrase
+                        for idx, token in enumerate(tokens)
+                        if token == phrase[0]):
+                    return input_class
+        return None
@@ -0,0 +1,127 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from bisect import bisect_left
+from collections import Counter
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+
+# Histogram bucket upper bounds in seconds, from 10us to 10s
+BUCKET_BOUNDS = tuple(base * 10 ** exp for exp in range(-5, 1)
+                      for base in (1, 2, 5)) + (10,)
+
+
+class LatencyHistogram:
+    """
+    Fixed-size latency histogram. Percentiles are reported as the upper
+    bound of the bucket they fall in, capped at the max recorded latency.
+    """
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.total = 0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.total += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        target = pct / 100 * self.total
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return min(BUCKET_BOUNDS[idx], self.max) \
+                    if idx < len(BUCKET_BOUNDS) else self.max
+        return 0.0
+
+    def snapshot(self) -> dict:
+        return {"count": self.total,
+                "p50_ms": self.percentile(50) * 1000,
+                "p95_ms": self.percentile(95) * 1000,
+                "p99_ms": self.percentile(99) * 1000,
+                "max_ms": self.max * 1000}
+
+
+class Metrics:
+    """
+    Collects per-entry-point latency histograms and branch counters. Nothing
+    is recorded unless `enabled` is True.
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._histograms = {}
+        self._counters = Counter()
+        self._lock = Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def count(self, name: str):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Get latency percentiles and branch counts collected so far
+        """
+        with self._lock:
+            return {"enabled": self.enabled,
+                    "latency": {name: histogram.snapshot() for name, histogram
+                                in self._histograms.items()},
+                    "counters": dict(self._counters)}
+
+
+def timed(name: str):
+    """
+    Decorate a skill method to record its latency in `self.metrics`
+    @param name: name of the entry point to record
+    """
+    def wrapper(func):
+        @wraps(func)
+        def timed_func(self, *args, **kwargs):
+            metrics = self.metrics
+            if not metrics.enabled:
+                return func(self, *args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                metrics.record(name, perf_counter() - start)
+        return timed_func
+    return wrapper
@@ -0,0 +1,73 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from ovos_utils.log import LOG
+
+from .classify import classify_recipient, extract_digits
+
+
+class PhoneNumber(NamedTuple):
+    e164: str
+    national: str
+    digits: str
+
+
+@lru_cache(maxsize=1024)
+def normalize_phone(raw: str, region: str = "US") -> Optional[PhoneNumber]:
+    """
+    Parse a phone number, caching results since parsing is expensive
+    @param raw: phone number string to parse
+    @param region: default region for numbers without a country code
+    @return: PhoneNumber if `raw` could be parsed, else None
+    """
+    # Imported here so skills that never handle phone numbers don't load it;
+    # phonenumbers loads region metadata as each region is first parsed
+    import phonenumbers
+    try:
+        parsed = phonenumbers.parse(raw, region)
+    except phonenumbers.NumberParseException as e:
+        LOG.error(e)
+        return None
+    return PhoneNumber(
+        phonenumbers.format_number(parsed,
+                                   phonenumbers.PhoneNumberFormat.E164),
+        phonenumbers.format_number(parsed,
+                                   phonenumbers.PhoneNumberFormat.NATIONAL),
+        extract_digits(raw))
+
+
+def get_cache_stats() -> dict:
+    """
+    Get hit/miss statistics for cached phone number operations
+    """
+    return {"normalize_phone": normalize_phone.cache_info()._asdict(),
+            "extract_digits": extract_digits.cache_info()._asdict(),
+            "classify_recipient": classify_recipient.cache_info()._asdict()}
@@ -0,0 +1,175 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from os.path import dirname, isfile, join
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .addresses import SPOKEN_SYMBOLS
+
+# Phrase lists holding the keywords used to extract message content. These
+# are not vocab files, so they are not registered with the intent parser.
+PHRASE_LISTS = ("extract_to", "extract_message", "extract_subject",
+                 "extract_with", "spoken_at", "spoken_dot")
+
+
+class ExtractionPhrases:
+    """
+    Extraction keywords for one language, tokenized for matching against
+    split utterances.
+    """
+    def __init__(self, vocab: Dict[str, List[str]]):
+        """
+        @param vocab: dict of PHRASE_LISTS name to phrases, in priority order
+        """
+        def _phrases(name):
+            return tuple(tuple(p.lower().split())
+                         for p in vocab.get(name) or () if p.strip())
+
+        self.to = _phrases("extract_to")
+        self.message = _phrases("extract_message")
+        self.subject = _phrases("extract_subject")
+        self.with_ = _phrases("extract_with")
+        self.at = frozenset(p[0] for p in _phrases("spoken_at")
+                            if len(p) == 1)
+        dots = [p[0] for p in _phrases("spoken_dot") if len(p) == 1]
+        self.symbols = {**SPOKEN_SYMBOLS, **{d: "." for d in dots}}
+        self._dot_pattern = re.compile(
+            f" (?:{'|'.join(re.escape(d) for d in dots)}) ") if dots else None
+
+    @staticmethod
+    def find(tokens: List[str], phrases: Tuple[Tuple[str, ...], ...],
+             trailing: bool = False) -> Optional[Tuple[int, int]]:
+        """
+        Find the first occurrence of the highest priority phrase in tokens
+        @param tokens: utterance tokens to search
+        @param phrases: tokenized phrases in priority order
+        @param trailing: if True, only match phrases followed by a token
+        @return: (start, end) token indices of the match, else None
+        """
+        for phrase in phrases:
+            size = len(phrase)
+            last = len(tokens) - size - (1 if trailing else 0)
+            for idx in range(last + 1):
+                if tokens[idx] == phrase[0] and \
+                        tuple(tokens[idx:idx + size]) == phrase:
+                    return idx, idx + size
+        return None
+
+    def join_dots(self, text: str) -> str:
+        """
+        Replace spoken dots between words, i.e. "example dot com" ->
+        "example.com"
+        @param text: spoken text
+        @return: text with spoken dots replaced
+        """
+        if not self._dot_pattern:
+            return text
+        return self._dot_pattern.sub(".", text)
+
+
+class PhraseIndex:
+    """
+    Per-language cache of extraction phrases. Languages are loaded the first
+    time they are requested, so unused languages cost nothing.
+    """
+    def __init__(self, load_phrases: Callable[[str, str], List[str]] = None):
+        """
+        @param load_phrases: callable returning phrases for a list name and
+            language, default reads this package's phrase lists
+        """
+        self._load_phrases = load_phrases or read_phrase_file
+        self._phrases = {}
+        self._lock = Lock()
+
+    def get(self, lang: str) -> ExtractionPhrases:
+        """
+        Get extraction phrases for a language, loading them on first use
+        @param lang: language to get phrases for
+        @return: ExtractionPhrases for `lang`
+        """
+        lang = lang.lower()
+        phrases = self._phrases.get(lang)
+        if phrases is None:
+            with self._lock:
+                phrases = self._phrases.get(lang)
+                if phrases is None:
+                    phrases = ExtractionPhrases(
+                        {name: self._load_phrases(name, lang)
+                         for name in PHRASE_LISTS})
+                    self._phrases[lang] = phrases
+        return phrases
+
+    def clear(self):
+        """
+        Drop all loaded languages so they are reloaded on next use
+        """
+        with self._lock:
+            self._phrases = {}
+
+    def __contains__(self, lang: str) -> bool:
+        return lang.lower() in self._phrases
+
+
+def read_vocab_file(name: str, lang: str) -> List[str]:
+    """
+    Read phrases from a vocab file packaged with this skill
+    @param name: vocab name
+    @param lang: language of the vocab file
+    @return: list of phrases, empty if the file does not exist
+    """
+    return read_lines(join(dirname(__file__), "vocab", lang, f"{name}.voc"))
+
+
+def read_phrase_file(name: str, lang: str) -> List[str]:
+    """
+    Read phrases from a phrase list packaged with this skill
+    @param name: phrase list name
+    @param lang: language of the phrase list
+    @return: list of phrases, empty if the file does not exist
+    """
+    return read_lines(join(dirname(__file__), "locale", lang, f"{name}.list"))
+
+
+def read_lines(path: Optional[str]) -> List[str]:
+    """
+    Read the non-empty, non-comment lines of a resource file
+    @param path: path to the file
+    @return: list of stripped lines, empty if the file does not exist
+    """
+    if not path or not isfile(path):
+        return []
+    with open(path) as f:
+        return [line.strip() for line in f
+                if line.strip() and not line.startswith("#")]
+
+
+# Default index for callers without a skill instance, i.e. offline scripts
+PHRASES = PhraseIndex()
@@ -0,0 +1,288 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import OrderedDict
+from difflib import get_close_matches
+from threading import Lock
+from time import time
+from typing import Dict, List, Optional
+
+from ovos_utils.log import LOG
+
+from .classify import MIXED, NAME, classify_recipient
+
+
+class RecentRecipient:
+    """
+    Recipient a user has sent to, with the addresses used by kind of address
+    (i.e. "phone", "email") and the number of sends
+    """
+    __slots__ = ("name", "addresses", "count", "last")
+
+    def __init__(self, name: str, addresses: Optional[Dict[str, str]] = None,
+                 count: int = 0, last: float = 0):
+        self.name = name
+        self.addresses = addresses or {}
+        self.count = count
+        self.last = last
+
+    @property
+    def weight(self) -> tuple:
+        return self.count, self.last
+
+    def __repr__(self):
+        return f"RecentRecipient(name={self.name!r}, " \
+               f"addresses={self.addresses!r}, count={self.count})"
+
+
+class _TrieNode:
+    __slots__ = ("children", "best")
+
+    def __init__(self):
+        self.children = {}
+        self.best = None
+
+
+class RecipientHistory:
+    """
+    One user's recent recipients, indexed by a prefix trie over each word
+    of their names. Every trie node holds the most frequently used recipient
+    below it, so completing a prefix is a walk of its characters.
+    """
+    __slots__ = ("max_size", "_recipients", "_names", "_trie")
+
+    def __init__(self, recipients: List[RecentRecipient] = (),
+                 max_size: int = 50):
+        self.max_size = max_size
+        self._recipients = {_key(r.name): r for r in recipients}
+        # Name, each word and each trailing part of a name -> most used
+        # recipient
+        self._names = None
+        self._trie = None
+        self._rebuild()
+
+    def record(self, name: str, address_type: str, address: str):
+        """
+        Record a send to a recipient
+        @param name: recipient name
+        @param address_type: kind of address sent to (i.e. "phone", "email")
+        @param address: address sent to
+        """
+        key = _key(name)
+        recipient = self._recipients.get(key)
+        if recipient is None:
+            recipient = self._recipients[key] = RecentRecipient(name)
+        recipient.addresses[address_type] = address
+        recipient.count += 1
+        recipient.last = time()
+        if len(self._recipients) > self.max_size:
+            # Drop the least used recipient and reindex
+            del self._recipients[_key(min(self._recipients.values(),
+                                          key=lambda r: r.weight).name)]
+            self._rebuild()
+        else:
+            self._insert(key, recipient)
+
+    def find(self, spoken: str) -> Optional[RecentRecipient]:
+        """
+        Find the recipient a spoken name refers to exactly
+        @param spoken: recipient name or one or more trailing words of it
+        @return: most used recipient with a name or whole word matching
+            `spoken`, else None
+        """
+        key = _key(spoken)
+        if key in self._recipients:
+            return self._recipients[key]
+        return self._names.get(key)
+
+    def complete(self, spoken: str, cutoff: float = 0.8,
+                 min_prefix: int = 4) -> Optional[RecentRecipient]:
+        """
+        Find the recipient a spoken name most likely refers to
+        @param spoken: full, partial or approximate recipient name
+        @param cutoff: minimum similarity for an approximate match
+        @param min_prefix: minimum length of `spoken` to complete or match
+            approximately
+        @return: exact match, else most used recipient with a word starting
+            with `spoken`, else closest match to a name or word in a name,
+            else None
+        """
+        key = _key(spoken)
+        if not key:
+            return None
+        recipient = self.find(key)
+        if recipient or len(key) < min_prefix:
+            return recipient
+        node = self._trie
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                break
+        else:
+            return node.best
+        match = get_close_matches(key, self._names, n=1, cutoff=cutoff)
+        return self._names[match[0]] if match else None
+
+    def to_dict(self) -> dict:
+        return {"recipients": [[r.name, dict(r.addresses), r.count, r.last]
+                               for r in self._recipients.values()]}
+
+    @classmethod
+    def from_dict(cls, data: dict, max_size: int = 50):
+        return cls([RecentRecipient(*r) for r in data["recipients"]],
+                   max_size)
+
+    def _insert(self, key: str, recipient: RecentRecipient):
+        words = key.split()
+        suffixes = [" ".join(words[idx:]) for idx in range(len(words))]
+        for name in set(words + suffixes):
+            best = self._names.get(name)
+            if best is None or recipient.weight >= best.weight:
+                self._names[name] = recipient
+        for name in suffixes:
+            node = self._trie
+            for char in name:
+                node = node.children.setdefault(char, _TrieNode())
+                if node.best is None or \
+                        recipient.weight >= node.best.weight:
+                    node.best = recipient
+
+    def _rebuild(self):
+        self._names = {}
+        self._trie = _TrieNode()
+        for key, recipient in sorted(self._recipients.items(),
+                                     key=lambda i: i[1].weight):
+            self._insert(key, recipient)
+
+    def __len__(self):
+        return len(self._recipients)
+
+
+class RecipientIndex:
+    """
+    Per-user recent recipient histories. Histories are kept in memory for
+    the `max_users` most recently active users; if a `journal` is set,
+    changes are written to it and histories are read back on first access.
+    """
+    def __init__(self, max_users: int = 1000, max_recipients: int = 50,
+                 cutoff: float = 0.8, min_prefix: int = 4):
+        self.max_users = max_users
+        self.max_recipients = max_recipients
+        self.cutoff = cutoff
+        self.min_prefix = min_prefix
+        self.journal = None
+        self._users = OrderedDict()
+        self._lock = Lock()
+
+    def record(self, user: str, name: str, address_type: str, address: str):
+        """
+        Record a send from a user to a named recipient
+        @param user: user who sent a message or placed a call
+        @param name: recipient name
+        @param address_type: kind of address sent to (i.e. "phone", "email")
+        @param address: address sent to
+        """
+        if not name or not address or \
+                classify_recipient(name).kind not in (NAME, MIXED):
+            return
+        with self._lock:
+            history = self._history(user)
+            if history is None:
+                history = RecipientHistory(max_size=self.max_recipients)
+                self._cache(user, history)
+            history.record(name, address_type, address)
+            # Snapshot while locked; the journal serializes on its own thread
+            snapshot = history.to_dict() if self.journal else None
+        if snapshot:
+            self.journal.record(user, snapshot)
+
+    def find(self, user: str,
+             spoken: Optional[str]) -> Optional[RecentRecipient]:
+        """
+        Resolve a full name or a whole word of a name to a recent recipient
+        @param user: user to resolve a recipient for
+        @param spoken: requested recipient
+        @return: matched RecentRecipient, else None
+        """
+        if not spoken:
+            return None
+        with self._lock:
+            history = self._history(user)
+            return history.find(spoken) if history else None
+
+    def complete(self, user: str,
+                 spoken: Optional[str]) -> Optional[RecentRecipient]:
+        """
+        Resolve a full, partial or misheard name to a recent recipient
+        @param user: user to resolve a recipient for
+        @param spoken: requested recipient
+        @return: matched RecentRecipient, else None
+        """
+        if not spoken:
+            return None
+        with self._lock:
+            history = self._history(user)
+            if history is None:
+                return None
+            return history.complete(spoken, self.cutoff, self.min_prefix)
+
+    def _history(self, user: str) -> Optional[RecipientHistory]:
+        """
+        Get a user's history, reading it from the journal if it is not in
+        memory. Must be called with the lock held.
+        """
+        history = self._users.get(user)
+        if history is not None:
+            self._users.move_to_end(user)
+            return history
+        if not self.journal or user not in self.journal:
+            return None
+        journaled = self.journal.load(user)
+        if not journaled:
+            return None
+        try:
+            history = RecipientHistory.from_dict(journaled[1],
+                                                 self.max_recipients)
+        except (KeyError, TypeError, ValueError) as e:
+            LOG.error(f"Invalid recipient history for {user}: {e}")
+            self.journal.remove(user)
+            return None
+        self._cache(user, history)
+        return history
+
+    def _cache(self, user: str, history: RecipientHistory):
+        while len(self._users) >= self.max_users:
+            self._users.popitem(last=False)
+        self._users[user] = history
+
+    def __len__(self):
+        return len(self._users)
+
+
+def _key(name: str) -> str:
+    return " ".join(name.lower().split())
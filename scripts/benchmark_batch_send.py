@@ -0,0 +1,108 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Benchmark of sending one batch request to many recipients compared to the
+equivalent number of single sends. Both paths normalize the recipients'
+phone numbers and are dispatched to the stand-in mobile client from
+`mobile_client.py`, which handles one request at a time with a simulated
+round trip latency. Latency is measured from the first send until every
+request is acknowledged.
+
+Usage: python scripts/benchmark_batch_send.py [--recipients N]
+    [--latency S] [--repeat N]
+"""
+
+from argparse import ArgumentParser
+from statistics import mean
+from time import perf_counter, sleep
+
+from ovos_utils.messagebus import Message
+
+from mobile_client import StandInMobileClient
+from skill_messaging.dispatch import MobileDispatcher
+from skill_messaging.phone import normalize_phone
+
+
+def send_single(dispatcher, message, recipients: list, text: str):
+    for recipient in recipients:
+        phone = normalize_phone(recipient)
+        dispatcher.send(message, "sms", {"number": phone.digits,
+                                         "text": text})
+    return len(recipients)
+
+
+def send_batch(dispatcher, message, recipients: list, text: str):
+    phones = [normalize_phone(r) for r in recipients]
+    dispatcher.send(message, "sms_batch",
+                    {"messages": [{"number": phone.digits, "text": text}
+                                  for phone in phones if phone]})
+    return 1
+
+
+def measure(send, recipients: list, latency: float) -> float:
+    """
+    Get the seconds taken to send to and be acknowledged for all recipients
+    """
+    normalize_phone.cache_clear()
+    client = StandInMobileClient(latency, serial=True)
+    dispatcher = MobileDispatcher(client.emit, max_pending=len(recipients),
+                                  tick=0.01)
+    client.dispatcher = dispatcher
+    message = Message("neon.messaging.send_batch",
+                      context={"username": "local", "mobile": True})
+    start = perf_counter()
+    requests = send(dispatcher, message, recipients, "running late")
+    while dispatcher.stats["acked"] < requests:
+        sleep(0.001)
+    elapsed = perf_counter() - start
+    dispatcher.shutdown()
+    return elapsed
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--recipients", type=int, default=20,
+                        help="recipients per batch (default 20)")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="client round trip in seconds (default 0.05)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="times to send each batch (default 5)")
+    args = parser.parse_args()
+
+    recipients = [f"(541) 555-{idx:04d}" for idx in range(args.recipients)]
+    for name, send in (("single", send_single), ("batch", send_batch)):
+        times = [measure(send, recipients, args.latency)
+                 for _ in range(args.repeat)]
+        print(f"{name:<6} {args.recipients} recipients: "
+              f"mean {mean(times) * 1e3:.1f}ms, "
+              f"min {min(times) * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
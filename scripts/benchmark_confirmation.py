@@ -0,0 +1,120 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Accuracy and throughput of the confirmation reply classifier compared to
+the previous substring scan used for email confirmations and `voc_match`
+used for SMS and call confirmations. Each line of the corpus is a JSON
+object with an `utterance` and the `expected` input class ("yes", "no" or
+null), i.e.:
+
+{"utterance": "I know", "expected": null}
+
+The default corpus, `corpus/confirmation_replies.jsonl`, covers ambiguous
+replies such as "I know", "don't send" and "do not".
+
+Usage: python scripts/benchmark_confirmation.py [corpus.jsonl]
+    [--lang en-us] [--repeat N]
+"""
+
+import json
+import re
+
+from argparse import ArgumentParser
+from os.path import dirname, join
+from time import perf_counter
+
+from skill_messaging.matcher import ConfirmationClassifier
+from skill_messaging.phrases import read_vocab_file
+
+DEFAULT_CORPUS = join(dirname(__file__), "corpus",
+                      "confirmation_replies.jsonl")
+INPUT_CLASSES = ("no", "yes")
+
+# Word lists previously hardcoded for email confirmations
+LEGACY_WORDS = {"no": ("no", "cancel", "discard", "nope", "stop", "don't"),
+                "yes": ("yes", "confirm", "affirmative", "send", "okay",
+                        "go", "sure", "ok")}
+
+
+def classify_substring(utt: str):
+    for input_class in INPUT_CLASSES:
+        if [word for word in LEGACY_WORDS[input_class] if word in utt]:
+            return input_class
+    return None
+
+
+def classify_voc_match(utt: str, vocab: dict):
+    for input_class in INPUT_CLASSES:
+        if any(re.match(r".*\b" + phrase + r"\b.*", utt, re.IGNORECASE)
+               for phrase in vocab[input_class]):
+            return input_class
+    return None
+
+
+def run(name: str, classify, cases: list, repeat: int):
+    errors = [case for case in cases
+              if classify(case["utterance"]) != case["expected"]]
+    start = perf_counter()
+    for _ in range(repeat):
+        for case in cases:
+            classify(case["utterance"])
+    elapsed = perf_counter() - start
+    count = len(cases) * repeat
+    print(f"{name:<10} {len(cases) - len(errors)}/{len(cases)} correct, "
+          f"{count / elapsed:>10,.0f} replies/s")
+    for case in errors:
+        print(f"    {case['utterance']!r}: expected {case['expected']}, "
+              f"got {classify(case['utterance'])}")
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS,
+                        help="path to a JSON lines corpus")
+    parser.add_argument("--lang", default="en-us",
+                        help="language of the corpus (default en-us)")
+    parser.add_argument("--repeat", type=int, default=1000,
+                        help="times to classify each reply (default 1000)")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+    vocab = {input_class: read_vocab_file(input_class, args.lang)
+             for input_class in INPUT_CLASSES}
+    classifier = ConfirmationClassifier(vocab)
+
+    run("substring", classify_substring, cases, args.repeat)
+    run("voc_match", lambda utt: classify_voc_match(utt, vocab), cases,
+        args.repeat)
+    run("classifier", lambda utt: classifier.classify(utt, INPUT_CLASSES),
+        cases, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
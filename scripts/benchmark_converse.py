@@ -0,0 +1,133 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Benchmark of `converse` calls per second for users with and without an
+open draft. Users with a draft are dictating an email body, so each call
+classifies the reply and runs a draft transition. The previous no-draft
+path, which formatted log messages before checking for a draft, is
+measured for comparison.
+
+Usage: python scripts/benchmark_converse.py [--users N] [--calls N]
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from neon_utils.user_utils import get_message_user
+from ovos_utils.log import LOG
+from ovos_utils.messagebus import Message
+
+from skill_messaging import MessagingSkill
+from skill_messaging.drafts import EmailDraft
+from skill_messaging.phrases import read_vocab_file
+
+
+class BenchmarkSkill(MessagingSkill):
+    """
+    Messaging skill that discards speech and reads vocab from this package
+    """
+    lang = "en-us"
+    _vocab = {}
+
+    def speak(self, *args, **kwargs):
+        pass
+
+    def speak_dialog(self, *args, **kwargs):
+        pass
+
+    def voc_list(self, voc_filename, lang=None):
+        key = (voc_filename, lang or self.lang)
+        if key not in self._vocab:
+            self._vocab[key] = read_vocab_file(*key)
+        return self._vocab[key]
+
+    def voc_match(self, utt, voc_filename, lang=None, exact=False):
+        phrases = self.voc_list(voc_filename, lang)
+        utt = utt.lower()
+        return utt in phrases if exact else \
+            any(phrase in utt for phrase in phrases)
+
+
+def converse_legacy_no_draft(drafts: dict, message) -> bool:
+    """
+    The previous `converse` up to finding the user has no draft
+    """
+    utterances = message.data.get("utterances")
+    LOG.info(f"utterances={utterances}")
+    LOG.debug(f"message.data={message.data}")
+    user = get_message_user(message)
+    if drafts and user in drafts:
+        return True
+    return False
+
+
+def run(name: str, converse, messages: list, calls: int):
+    start = perf_counter()
+    for idx in range(calls):
+        converse(messages[idx % len(messages)])
+    elapsed = perf_counter() - start
+    print(f"{name:<16} {calls / elapsed:>12,.0f} calls/s "
+          f"({elapsed / calls * 1e6:.2f}us each)")
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=1000,
+                        help="number of users of each kind (default 1000)")
+    parser.add_argument("--calls", type=int, default=100000,
+                        help="converse calls per measurement "
+                             "(default 100000)")
+    args = parser.parse_args()
+
+    skill = BenchmarkSkill()
+    skill.drafts.max_size = args.users
+    legacy_drafts = {}
+    drafting = []
+    idle = []
+    for idx in range(args.users):
+        user = f"drafting{idx}"
+        skill.drafts[user] = EmailDraft("friend@example.com", "lunch",
+                                        next_input="body")
+        legacy_drafts[user] = {"kind": "email", "next_input": "body"}
+        drafting.append(Message("recognizer_loop:utterance",
+                                {"utterances": ["see you at noon"]},
+                                {"username": user}))
+        idle.append(Message("recognizer_loop:utterance",
+                            {"utterances": ["what time is it"]},
+                            {"username": f"idle{idx}"}))
+
+    run("no draft (old)", lambda m: converse_legacy_no_draft(legacy_drafts,
+                                                             m),
+        idle, args.calls)
+    run("no draft", skill.converse, idle, args.calls)
+    run("with draft", skill.converse, drafting, args.calls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Benchmark of confirmation prompt rendering latency with the skill's
+`dialog_renderer`, a MustacheDialogRenderer that `speak_dialog` renders from,
+and with a warm DialogCache. Both keep dialog files in memory; the renderer
+formats each line and expands its `(a|b)` options on every render, while the
+cache expands options and splits slots once when a dialog is loaded.
+
+Usage: python scripts/benchmark_dialog_rendering.py [--lang en-us]
+    [--repeat N]
+"""
+
+from argparse import ArgumentParser
+from os.path import dirname, isfile, join
+from statistics import mean, quantiles
+from time import perf_counter
+
+from ovos_utils.dialog import load_dialogs
+from skill_messaging.dialogs import DialogCache
+
+DIALOG_DIR = join(dirname(dirname(__file__)), "dialog")
+
+# Prompt dialogs with the slot values they are rendered with
+PROMPTS = (
+    ("ConfirmCall", {"name": "Alice Brown", "number": "(541) 555-0100"}),
+    ("ConfirmMessage", {"kind": "text message", "name": "Alice Brown",
+                        "address": "(541) 555-0100",
+                        "message": "running late"}),
+    ("ConfirmEmail", {}),
+    ("ConfirmSend", {}),
+    ("GetEmailBody", {}),
+    ("GetEmailSubject", {}),
+)
+
+
+def find_dialog(name: str, lang: str):
+    path = join(DIALOG_DIR, lang, f"{name}.dialog")
+    return path if isfile(path) else None
+
+
+def run(name: str, render, repeat: int):
+    times = []
+    for _ in range(repeat):
+        for prompt, data in PROMPTS:
+            start = perf_counter()
+            render(prompt, data)
+            times.append(perf_counter() - start)
+    p50, p95 = [quantiles(times, n=100)[idx] for idx in (49, 94)]
+    print(f"{name:<8} mean {mean(times) * 1e6:.1f}us "
+          f"p50 {p50 * 1e6:.1f}us p95 {p95 * 1e6:.1f}us")
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lang", default="en-us",
+                        help="language to render dialogs in (default en-us)")
+    parser.add_argument("--repeat", type=int, default=2000,
+                        help="times to render each prompt (default 2000)")
+    args = parser.parse_args()
+
+    renderer = load_dialogs(join(DIALOG_DIR, args.lang))
+    cache = DialogCache(find_dialog)
+    cache.warm(args.lang, [prompt for prompt, _ in PROMPTS])
+    run("renderer", renderer.render, args.repeat)
+    run("cache", lambda prompt, data: cache.render(prompt, args.lang, data),
+        args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Memory benchmark of in-progress drafts stored as slotted Draft objects
+compared to the previous per-draft dicts, which kept a reference to the
+full context of the message that started the draft. Each draft gets its
+own context, as each request arrives in its own message.
+
+Usage: python scripts/benchmark_draft_memory.py [--drafts N]
+"""
+
+import tracemalloc
+
+from argparse import ArgumentParser
+
+from skill_messaging.drafts import EmailDraft, SmsDraft
+
+
+def make_context(idx: int) -> dict:
+    """
+    Build a message context like the ones drafts are started from
+    """
+    username = f"user{idx}"
+    return {
+        "client_name": "mobile_example",
+        "source": "mobile_client",
+        "destination": ["skills"],
+        "mobile": True,
+        "username": username,
+        "klat_data": {"cid": f"conversation{idx}", "sid": f"shout{idx}",
+                      "request_id": f"request{idx}", "title": "",
+                      "klat_id": idx},
+        "timing": {"transcribed": 1660000000.0 + idx,
+                   "text_parsers": 0.012, "speech_start": 0.8,
+                   "handle_utterance": 1660000000.5 + idx},
+        "cc_data": {"raw_utterance": f"send an email to friend {idx} "
+                                     f"about lunch tomorrow",
+                    "speak_execute": "", "execute_from_script": False},
+        "user_profiles": [{
+            "user": {"username": username, "first_name": "Example",
+                     "last_name": "User", "email": f"{username}@example.com",
+                     "phone": "5415550100", "about": "",
+                     "password": "", "dob": "YYYY/MM/DD"},
+            "speech": {"stt_language": "en-us", "tts_language": "en-us",
+                       "tts_gender": "female", "speed_multiplier": 1.0,
+                       "secondary_tts_gender": "male",
+                       "secondary_tts_language": "",
+                       "alt_languages": ["en"]},
+            "units": {"time": 12, "date": "MDY", "measure": "imperial"},
+            "location": {"lat": 47.48, "lng": -122.21, "city": "Renton",
+                         "state": "Washington", "country": "United States",
+                         "tz": "America/Los_Angeles", "utc": -8.0},
+            "response_mode": {"speed_mode": "quick",
+                              "hesitation": False, "limit_dialog": False},
+        }],
+    }
+
+
+def legacy_draft(idx: int) -> dict:
+    if idx % 2:
+        return {"kind": "email", "recipient": f"friend{idx}@example.com",
+                "subject": "lunch", "body": "", "context": make_context(idx),
+                "next_input": "body"}
+    return {"kind": "text message", "recipient": f"friend {idx}",
+            "message": "running late", "context": make_context(idx),
+            "next_input": "confirmation"}
+
+
+def slotted_draft(idx: int):
+    context = make_context(idx)
+    if idx % 2:
+        return EmailDraft(f"friend{idx}@example.com", "lunch",
+                          next_input="body",
+                          klat_data=context.get("klat_data"))
+    return SmsDraft(f"friend {idx}", "running late",
+                    next_input="confirmation",
+                    klat_data=context.get("klat_data"))
+
+
+def measure(build, count: int) -> int:
+    """
+    Get the bytes allocated to keep `count` drafts
+    """
+    tracemalloc.start()
+    drafts = {f"user{idx}": build(idx) for idx in range(count)}
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del drafts
+    return size
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--drafts", type=int, default=100000,
+                        help="number of concurrent drafts (default 100000)")
+    args = parser.parse_args()
+
+    for name, build in (("dict", legacy_draft), ("slotted", slotted_draft)):
+        size = measure(build, args.drafts)
+        print(f"{name:<8} {size / 2 ** 20:>8.1f} MiB total, "
+              f"{size / args.drafts:>6,.0f} bytes per draft")
+
+
+if __name__ == "__main__":
+    main()
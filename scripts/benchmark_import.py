@@ -0,0 +1,93 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Startup benchmark of importing the skill with `phonenumbers` imported on
+first use compared to importing it with the skill, as before. Each case is
+imported in a fresh interpreter, reporting import time and peak RSS; the
+cost of the first phone number parse after a deferred import is reported
+separately.
+
+Usage: python scripts/benchmark_import.py [--repeat N]
+"""
+
+import subprocess
+import sys
+
+from argparse import ArgumentParser
+from statistics import median
+
+CHILD = """
+import resource
+from time import perf_counter
+start = perf_counter()
+{code}
+elapsed = perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+CASES = (
+    ("interpreter", "pass"),
+    ("deferred", "import skill_messaging"),
+    ("eager", "import phonenumbers\nimport skill_messaging"),
+    ("first parse", "import skill_messaging\n"
+                    "from skill_messaging.phone import normalize_phone\n"
+                    "normalize_phone('(541) 555-0100')"),
+)
+
+
+def measure(code: str) -> tuple:
+    """
+    Run code in a new interpreter
+    @return: (seconds to run `code`, peak RSS in KiB)
+    """
+    output = subprocess.run([sys.executable, "-c", CHILD.format(code=code)],
+                            capture_output=True, text=True, check=True)
+    elapsed, rss = output.stdout.split()[-2:]
+    rss = int(rss)
+    if sys.platform == "darwin":
+        # ru_maxrss is in bytes on macOS and KiB on Linux
+        rss //= 1024
+    return float(elapsed), rss
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="interpreters to start per case (default 5)")
+    args = parser.parse_args()
+
+    for name, code in CASES:
+        results = [measure(code) for _ in range(args.repeat)]
+        elapsed = median(r[0] for r in results)
+        rss = median(r[1] for r in results)
+        print(f"{name:<12} {elapsed * 1e3:>8.1f}ms {rss / 1024:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
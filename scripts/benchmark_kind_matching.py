@@ -0,0 +1,110 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Micro-benchmark of message kind matching with the compiled MessageMatcher
+compared to the previous sequential `voc_match` calls. Utterances are read
+from the `utterance` field of a JSON lines corpus, such as the
+`corpus/extractors.jsonl` default.
+
+Usage: python scripts/benchmark_kind_matching.py [corpus.jsonl]
+    [--lang en-us] [--repeat N]
+"""
+
+import json
+import re
+
+from argparse import ArgumentParser
+from os.path import dirname, join
+from time import perf_counter
+
+from skill_messaging.matcher import MessageMatcher
+from skill_messaging.phrases import read_vocab_file
+
+DEFAULT_CORPUS = join(dirname(__file__), "corpus", "extractors.jsonl")
+
+KINDS = ("klat", "email", "sms")
+
+
+def voc_match(utt: str, phrases: list) -> bool:
+    """
+    Match vocab phrases the way `OVOSSkill.voc_match` does
+    """
+    return any(re.match(r".*\b" + phrase + r"\b.*", utt, re.IGNORECASE)
+               for phrase in phrases)
+
+
+def match_kind_legacy(utt: str, vocab: dict):
+    """
+    Match the message kind with one `voc_match` call per kind, in priority
+    order
+    """
+    for kind in KINDS:
+        if voc_match(utt, vocab[kind]):
+            return kind
+    return None
+
+
+def run(name: str, match, utterances: list, repeat: int):
+    start = perf_counter()
+    for _ in range(repeat):
+        for utt in utterances:
+            match(utt)
+    elapsed = perf_counter() - start
+    count = len(utterances) * repeat
+    print(f"{name:<10} {count / elapsed:>12,.0f} utterances/s "
+          f"({elapsed / count * 1e6:.2f}us each)")
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS,
+                        help="path to a JSON lines corpus")
+    parser.add_argument("--lang", default="en-us",
+                        help="language of the corpus (default en-us)")
+    parser.add_argument("--repeat", type=int, default=10,
+                        help="times to match each utterance (default 10)")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        utterances = [json.loads(line).get("utterance") for line in f
+                      if line.strip()]
+    utterances = [u for u in utterances if u]
+    vocab = {kind: read_vocab_file(kind, args.lang) for kind in KINDS}
+    matcher = MessageMatcher(vocab)
+
+    mismatched = sum(matcher.match_kind(u) != match_kind_legacy(u, vocab)
+                     for u in utterances)
+    print(f"{len(utterances)} utterances, {mismatched} matched differently")
+    run("voc_match", lambda u: match_kind_legacy(u, vocab), utterances,
+        args.repeat)
+    run("compiled", matcher.match_kind, utterances, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
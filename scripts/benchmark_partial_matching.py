@@ -0,0 +1,121 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Benchmark of end-of-speech to match latency with and without incremental
+parsing of partial transcripts. Each line of the input is a JSON object with
+the `partials` recorded from streaming STT, the last being the final
+transcript, i.e.:
+
+{"partials": ["text", "text bob", "text bob that", "text bob that says hi"]}
+
+Lines with only an `utterance` are replayed one word at a time, as are
+those of the default `corpus/extractors.jsonl`.
+
+Usage: python scripts/benchmark_partial_matching.py [partials.jsonl]
+    [--lang en-us] [--repeat N]
+"""
+
+import json
+
+from argparse import ArgumentParser
+from os.path import dirname, join
+from statistics import mean, quantiles
+from time import perf_counter
+
+from skill_messaging.matcher import MessageMatcher
+from skill_messaging.phrases import PhraseIndex, read_vocab_file
+from skill_messaging.streaming import UtteranceParse
+
+DEFAULT_CORPUS = join(dirname(__file__), "corpus", "extractors.jsonl")
+
+
+def load_partials(line: str) -> list:
+    """
+    Get the sequence of transcripts for one input line
+    @param line: JSON-encoded input entry
+    @return: list of partial transcripts, ending with the final transcript
+    """
+    case = json.loads(line)
+    if case.get("partials"):
+        return case["partials"]
+    words = case["utterance"].split()
+    return [" ".join(words[:idx]) for idx in range(1, len(words) + 1)]
+
+
+def match(parse: UtteranceParse) -> tuple:
+    """
+    Resolve the match fields `CMS_match_message_phrase` needs
+    """
+    return parse.kind or parse.sms()[0] or parse.email()
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("partials", nargs="?", default=DEFAULT_CORPUS,
+                        help="path to a JSON lines file")
+    parser.add_argument("--lang", default="en-us",
+                        help="language of the transcripts (default en-us)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="times to replay each sequence (default 5)")
+    args = parser.parse_args()
+
+    with open(args.partials, encoding="utf-8") as f:
+        sequences = [load_partials(line) for line in f if line.strip()]
+    sequences = [seq for seq in sequences if seq]
+    phrases = PhraseIndex().get(args.lang)
+    matcher = MessageMatcher({kind: read_vocab_file(kind, args.lang)
+                              for kind in ("klat", "email", "sms")})
+
+    full = []
+    streamed = []
+    for _ in range(args.repeat):
+        for seq in sequences:
+            start = perf_counter()
+            match(UtteranceParse(phrases, matcher).update(seq[-1]))
+            full.append(perf_counter() - start)
+
+            parse = UtteranceParse(phrases, matcher)
+            for partial in seq[:-1]:
+                parse.update(partial)
+                match(parse)
+            start = perf_counter()
+            match(parse.update(seq[-1]))
+            streamed.append(perf_counter() - start)
+
+    print(f"{len(sequences)} sequences, "
+          f"{sum(len(seq) for seq in sequences) / len(sequences):.1f} "
+          f"partials per sequence")
+    for name, times in (("final only", full), ("streamed", streamed)):
+        p50, p95 = [quantiles(times, n=100)[idx] for idx in (49, 94)]
+        print(f"{name:<10} mean {mean(times) * 1e6:.1f}us "
+              f"p50 {p50 * 1e6:.1f}us p95 {p95 * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Throughput benchmark of recipient classification compared to the previous
+regex and per-character scans. Recipients are read from the `recipient`
+field of a JSON lines corpus, such as the `corpus/extractors.jsonl` default.
+
+Usage: python scripts/benchmark_recipient_classification.py [corpus.jsonl]
+    [--repeat N]
+"""
+
+import json
+import re
+
+from argparse import ArgumentParser
+from os.path import dirname, join
+from time import perf_counter
+
+from skill_messaging.classify import EMAIL, MIXED, NAME, NUMBER, \
+    classify_recipient
+
+DEFAULT_CORPUS = join(dirname(__file__), "corpus", "extractors.jsonl")
+
+
+def classify_legacy(raw: str) -> tuple:
+    """
+    Classify a recipient with the scans previously repeated across the skill
+    """
+    digits = "".join(re.findall(r"\d", raw))
+    if "@" in raw:
+        kind = EMAIL
+    elif any(char.isalpha() for char in raw):
+        kind = MIXED if re.sub(r"[^\d]+", "", raw) else NAME
+    else:
+        kind = NUMBER if digits else NAME
+    return kind, digits
+
+
+def run(name: str, classify, recipients: list, repeat: int):
+    start = perf_counter()
+    for _ in range(repeat):
+        for recipient in recipients:
+            classify(recipient)
+    elapsed = perf_counter() - start
+    count = len(recipients) * repeat
+    print(f"{name:<16} {count / elapsed:>12,.0f} recipients/s "
+          f"({elapsed / count * 1e6:.2f}us each)")
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS,
+                        help="path to a JSON lines corpus")
+    parser.add_argument("--repeat", type=int, default=10,
+                        help="times to classify each recipient (default 10)")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        recipients = [json.loads(line).get("recipient") for line in f
+                      if line.strip()]
+    recipients = [r for r in recipients if r]
+
+    mismatched = sum(tuple(classify_recipient.__wrapped__(r)) !=
+                     classify_legacy(r) for r in recipients)
+    print(f"{len(recipients)} recipients, {mismatched} classified "
+          f"differently")
+    run("legacy", classify_legacy, recipients, args.repeat)
+    run("translate", classify_recipient.__wrapped__, recipients, args.repeat)
+    run("translate+cache", classify_recipient, recipients, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
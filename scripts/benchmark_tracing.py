@@ -0,0 +1,104 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Benchmark of SMS and email extractor throughput with tracing off, sampled
+and on for every event. Utterances are read from the `utterance` field of
+a JSON lines corpus, such as the `corpus/extractors.jsonl` default. Trace
+events are written to a logger that discards them, so only the cost of
+building and formatting events is measured.
+
+Usage: python scripts/benchmark_tracing.py [corpus.jsonl] [--sample-rate F]
+    [--repeat N]
+"""
+
+import json
+import logging
+
+from argparse import ArgumentParser
+from os.path import dirname, join
+from time import perf_counter
+
+import skill_messaging.tracing
+
+from skill_messaging import MessagingSkill
+from skill_messaging.tracing import TRACER
+
+DEFAULT_CORPUS = join(dirname(__file__), "corpus", "extractors.jsonl")
+
+
+def extract(utterance: str):
+    MessagingSkill._extract_content_sms(utterance)
+    MessagingSkill._extract_content_email(utterance)
+
+
+def run(name: str, sample_rate: float, utterances: list, repeat: int):
+    TRACER.sample_rate = sample_rate
+    start = perf_counter()
+    for _ in range(repeat):
+        for utterance in utterances:
+            extract(utterance)
+    elapsed = perf_counter() - start
+    count = len(utterances) * repeat
+    print(f"{name:<8} {count / elapsed:>10,.0f} utterances/s "
+          f"({elapsed / count * 1e6:.2f}us each)")
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS,
+                        help="path to a JSON lines corpus")
+    parser.add_argument("--sample-rate", type=float, default=0.01,
+                        help="fraction of events traced when sampled "
+                             "(default 0.01)")
+    parser.add_argument("--repeat", type=int, default=10,
+                        help="times to extract each utterance (default 10)")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        utterances = [json.loads(line).get("utterance") for line in f
+                      if line.strip()]
+    utterances = [u for u in utterances if u]
+
+    sink = logging.getLogger("messaging.benchmark.tracing")
+    sink.addHandler(logging.NullHandler())
+    sink.propagate = False
+    sink.setLevel(logging.INFO)
+    skill_messaging.tracing.LOG = sink
+
+    print(f"{len(utterances)} utterances")
+    # Warm up caches shared by every run
+    for utterance in utterances:
+        extract(utterance)
+    run("off", 0.0, utterances, args.repeat)
+    run("sampled", args.sample_rate, utterances, args.repeat)
+    run("on", 1.0, utterances, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
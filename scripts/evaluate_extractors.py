@@ -0,0 +1,120 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Offline evaluation of the messaging skill extractors against a labeled
+corpus. Each line of the corpus is a JSON object with an `utterance`, the
+extractor to run as `kind` ("sms", "email" or "call") and the expected
+`recipient` plus `message`, `subject` or `number` as applicable, i.e.:
+
+{"utterance": "text bob that says hi", "kind": "sms",
+ "recipient": "bob", "message": "hi"}
+
+The corpus defaults to `corpus/extractors.jsonl`.
+
+Usage: python scripts/evaluate_extractors.py [corpus.jsonl] [--processes N]
+"""
+
+import json
+
+from argparse import ArgumentParser
+from collections import defaultdict
+from multiprocessing import Pool
+from os.path import dirname, join
+from time import perf_counter
+
+from neon_utils.skills.common_message_skill import CMSMatchLevel
+from skill_messaging import MessagingSkill
+
+DEFAULT_CORPUS = join(dirname(__file__), "corpus", "extractors.jsonl")
+
+
+def evaluate(line: str):
+    """
+    Run the extractor for one labeled corpus line
+    @param line: JSON-encoded corpus entry
+    @return: (CMSMatchLevel name, True if all expected fields matched)
+    """
+    case = json.loads(line)
+    utterance = case["utterance"]
+    if case["kind"] == "sms":
+        recipient, message, conf = \
+            MessagingSkill._extract_content_sms(utterance)
+        result = {"recipient": recipient, "message": message}
+    elif case["kind"] == "email":
+        recipient, subject = MessagingSkill._extract_content_email(utterance)
+        conf = CMSMatchLevel.MEDIA if recipient and subject else \
+            CMSMatchLevel.LOOSE if recipient else None
+        result = {"recipient": recipient, "subject": subject}
+    elif case["kind"] == "call":
+        number, conf = MessagingSkill._extract_content_call(utterance)
+        # The call extractor only parses numbers; the recipient is the input
+        result = {"number": number}
+    else:
+        raise ValueError(f"Unknown kind: {case['kind']}")
+    correct = all(result[field] == case.get(field) for field in result)
+    return conf.name if conf else "NONE", correct
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS,
+                        help="path to a JSON lines corpus")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="number of worker processes (default 1)")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+
+    start = perf_counter()
+    if args.processes > 1:
+        with Pool(args.processes) as pool:
+            results = pool.map(evaluate, lines,
+                               chunksize=max(1, len(lines) //
+                                             (args.processes * 4)))
+    else:
+        results = [evaluate(line) for line in lines]
+    elapsed = perf_counter() - start
+
+    levels = defaultdict(lambda: [0, 0])
+    for level, correct in results:
+        levels[level][0] += 1
+        levels[level][1] += correct
+    print(f"{len(results)} utterances in {elapsed:.3f}s "
+          f"({len(results) / elapsed:.0f} utterances/s)")
+    for level, (total, correct) in sorted(levels.items()):
+        print(f"{level:<6} {correct}/{total} correct "
+              f"({100 * correct / total:.1f}%)")
+    total_correct = sum(correct for _, correct in results)
+    print(f"TOTAL  {total_correct}/{len(results)} correct "
+          f"({100 * total_correct / len(results):.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
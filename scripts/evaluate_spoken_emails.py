@@ -0,0 +1,144 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Golden corpus check and benchmark of the spoken email address normalizer.
+Each line of the corpus is a JSON object with the `spoken` address and the
+`expected` address, or null if it should not be parsed as an address, i.e.:
+
+{"spoken": "john dot doe at example dot co dot uk",
+ "expected": "john.doe@example.co.uk"}
+
+Mismatches are listed and the script exits with status 1 if there are any.
+Throughput is compared to the previous chained `replace` and `split`
+calls, and time per word is reported for increasingly long addresses to
+show normalization is linear in the length of the input.
+
+Usage: python scripts/evaluate_spoken_emails.py [corpus.jsonl]
+    [--lang en-us] [--repeat N]
+"""
+
+import json
+import sys
+
+from argparse import ArgumentParser
+from os.path import dirname, join
+from time import perf_counter
+
+from skill_messaging.addresses import normalize_spoken_email
+from skill_messaging.phrases import PhraseIndex
+
+DEFAULT_CORPUS = join(dirname(__file__), "corpus", "spoken_emails.jsonl")
+
+
+def normalize_legacy(recipient: str) -> str:
+    """
+    Rebuild a spoken address with the calls previously in
+    `_extract_content_email`
+    """
+    if "dot" in recipient.split():
+        recipient = recipient.replace(" dot ", ".")
+    if "at" in recipient.split():
+        recipient = recipient.replace(" at ", "@").lower()
+    if "@" in recipient:
+        recipient_prefix = recipient.split("@", 1)[0].replace(" ", "")
+        recipient_domain = \
+            recipient.split("@", 1)[1].split(".")[0].replace(" ", "")
+        tld_parts = recipient.split("@", 1)[1].split(".")[1:]
+        domain_parts = [part.split()[0] for part in tld_parts]
+        tld = ".".join(domain_parts)
+        recipient = f"{recipient_prefix}@{recipient_domain}.{tld}"
+    return recipient
+
+
+def normalize_legacy_safe(text: str):
+    try:
+        return normalize_legacy(text)
+    except IndexError:
+        return None
+
+
+def throughput(name: str, normalize, spoken: list, repeat: int):
+    start = perf_counter()
+    for _ in range(repeat):
+        for text in spoken:
+            normalize(text)
+    elapsed = perf_counter() - start
+    count = len(spoken) * repeat
+    print(f"{name:<10} {count / elapsed:>10,.0f} addresses/s "
+          f"({elapsed / count * 1e6:.2f}us each)")
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS,
+                        help="path to a JSON lines corpus")
+    parser.add_argument("--lang", default="en-us",
+                        help="language of the corpus (default en-us)")
+    parser.add_argument("--repeat", type=int, default=1000,
+                        help="times to normalize each address "
+                             "(default 1000)")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+    phrases = PhraseIndex().get(args.lang)
+
+    def normalize(text: str):
+        return normalize_spoken_email(text, phrases.at, phrases.symbols)
+
+    failures = [(case, normalize(case["spoken"])) for case in cases
+                if normalize(case["spoken"]) != case["expected"]]
+    print(f"{len(cases) - len(failures)}/{len(cases)} addresses correct")
+    for case, result in failures:
+        print(f"    {case['spoken']!r}: expected {case['expected']!r}, "
+              f"got {result!r}")
+
+    legacy_correct = sum(normalize_legacy_safe(case["spoken"]) ==
+                         case["expected"] for case in cases)
+    print(f"{legacy_correct}/{len(cases)} addresses correct with the "
+          f"previous parsing")
+
+    spoken = [case["spoken"] for case in cases]
+    throughput("legacy", normalize_legacy_safe, spoken, args.repeat)
+    throughput("normalizer", normalize, spoken, args.repeat)
+
+    for words in (10, 100, 1000, 10000):
+        text = " dot ".join(["part"] * (words // 2)) + " at example dot com"
+        count = max(1, args.repeat * 10 // words)
+        start = perf_counter()
+        for _ in range(count):
+            normalize(text)
+        elapsed = (perf_counter() - start) / count
+        print(f"{words:>6} words {elapsed * 1e6:>10.1f}us "
+              f"({elapsed / words * 1e9:.0f}ns per word)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Load test of `converse` throughput as the number of skill workers grows.
+Every worker process receives every message, as on a shared messagebus,
+and continues drafts only for the users it serves. Each user is dictating
+an email body. Throughput is the number of messages divided by the time
+the slowest worker takes to go through all of them.
+
+Usage: python scripts/load_test_workers.py [--workers 1 2 4]
+    [--users N] [--messages N]
+"""
+
+from argparse import ArgumentParser
+from multiprocessing import Barrier, Pool
+from os import cpu_count
+from time import perf_counter
+
+from ovos_utils.messagebus import Message
+
+from benchmark_converse import BenchmarkSkill
+from skill_messaging.drafts import EmailDraft
+
+_barrier = None
+
+
+def _init(barrier):
+    global _barrier
+    _barrier = barrier
+
+
+def run_worker(args: tuple) -> tuple:
+    """
+    Run one skill worker over every message
+    @param args: (worker index, worker count, users, messages)
+    @return: (seconds taken, number of messages handled)
+    """
+    worker_index, worker_count, users, messages = args
+    skill = BenchmarkSkill()
+    skill._worker_count = worker_count
+    skill._worker_index = worker_index
+    skill.drafts.max_size = users
+    for idx in range(users):
+        user = f"user{idx}"
+        if skill._owns_user(user):
+            skill.drafts[user] = EmailDraft("friend@example.com", "lunch",
+                                            next_input="body")
+    requests = [Message("recognizer_loop:utterance",
+                        {"utterances": ["see you at noon"]},
+                        {"username": f"user{idx % users}"})
+                for idx in range(messages)]
+    _barrier.wait()
+    start = perf_counter()
+    handled = sum(bool(skill.converse(message)) for message in requests)
+    return perf_counter() - start, handled
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="worker counts to test (default 1 2 4)")
+    parser.add_argument("--users", type=int, default=1000,
+                        help="number of users (default 1000)")
+    parser.add_argument("--messages", type=int, default=100000,
+                        help="number of messages (default 100000)")
+    args = parser.parse_args()
+
+    print(f"{cpu_count()} CPUs")
+    for workers in args.workers:
+        with Pool(workers, _init, (Barrier(workers),)) as pool:
+            results = pool.map(run_worker,
+                               [(idx, workers, args.users, args.messages)
+                                for idx in range(workers)])
+        elapsed = max(result[0] for result in results)
+        handled = sum(result[1] for result in results)
+        print(f"{workers} workers: {args.messages / elapsed:>10,.0f} "
+              f"messages/s, {handled} handled, per worker "
+              f"{[result[1] for result in results]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Local stand-in for the mobile client, used to exercise MobileDispatcher
+without a phone. The stand-in receives dispatched requests in place of the
+messagebus and acknowledges them after a simulated latency, either
+concurrently or one request at a time, optionally dropping a fraction of first attempts or never acknowledging at all, like a
+client that does not implement `neon.messaging.mobile.ack`. Duplicate
+deliveries are detected by request ID.
+
+Running this script queues a number of sends and reports how long the
+dispatcher takes to drain them.
+
+Usage: python scripts/mobile_client.py [--sends N] [--action sms]
+    [--latency S] [--drop F] [--no-ack] [--workers N]
+"""
+
+from argparse import ArgumentParser
+from collections import Counter
+from queue import Queue
+from random import random
+from threading import Event, Lock, Thread, Timer
+from time import perf_counter, sleep
+
+from ovos_utils.messagebus import Message
+
+from skill_messaging.dispatch import MobileDispatcher
+
+
+class StandInMobileClient:
+    """
+    Receives requests emitted by a MobileDispatcher and acknowledges them
+    """
+    def __init__(self, latency: float = 0.0, drop: float = 0.0,
+                 ack: bool = True, serial: bool = False):
+        """
+        @param latency: seconds before each request is acknowledged
+        @param drop: fraction of first deliveries to ignore
+        @param ack: if False, never acknowledge requests
+        @param serial: if True, handle one request at a time, like a client
+            making one round trip per request
+        """
+        self.latency = latency
+        self.drop = drop
+        self.ack = ack
+        self._queue = None
+        if serial:
+            self._queue = Queue()
+            Thread(target=self._run, daemon=True).start()
+        self.dispatcher = None
+        self.deliveries = Counter()
+        self.handled = 0
+        self.done = Event()
+        self.expected = 0
+        self._lock = Lock()
+
+    def emit(self, message):
+        """
+        Handle a request, in place of `bus.emit`
+        """
+        request_id = message.data["request_id"]
+        with self._lock:
+            self.deliveries[request_id] += 1
+            first = self.deliveries[request_id] == 1
+            if first:
+                self.handled += 1
+                if self.handled >= self.expected:
+                    self.done.set()
+        if not self.ack or (first and random() < self.drop):
+            return
+        if self._queue:
+            self._queue.put(request_id)
+        elif self.latency:
+            Timer(self.latency, self.dispatcher.handle_ack,
+                  (request_id,)).start()
+        else:
+            self.dispatcher.handle_ack(request_id)
+
+    def _run(self):
+        while True:
+            request_id = self._queue.get()
+            sleep(self.latency)
+            self.dispatcher.handle_ack(request_id)
+
+    @property
+    def duplicates(self) -> int:
+        return sum(count - 1 for count in self.deliveries.values())
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sends", type=int, default=5000,
+                        help="number of requests to queue (default 5000)")
+    parser.add_argument("--action", default="sms",
+                        help="mobile action to request (default sms)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds before each ack (default 0)")
+    parser.add_argument("--drop", type=float, default=0.0,
+                        help="fraction of first deliveries to ignore")
+    parser.add_argument("--no-ack", action="store_true",
+                        help="never acknowledge requests")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="dispatcher worker threads (default 4)")
+    parser.add_argument("--ack-timeout", type=float, default=1.0,
+                        help="seconds to wait for an ack (default 1)")
+    args = parser.parse_args()
+
+    client = StandInMobileClient(args.latency, args.drop, not args.no_ack)
+    client.expected = args.sends
+    dispatcher = MobileDispatcher(client.emit, max_workers=args.workers,
+                                  max_pending=args.sends,
+                                  ack_timeout=args.ack_timeout,
+                                  backoff=0.1, tick=0.05)
+    client.dispatcher = dispatcher
+    message = Message("recognizer_loop:utterance",
+                      context={"username": "local", "mobile": True})
+    if not args.no_ack:
+        # Let the dispatcher learn that this client acknowledges requests
+        dispatcher.send(message, args.action, {"warmup": True})
+        sleep(args.ack_timeout / 10)
+
+    start = perf_counter()
+    for idx in range(args.sends):
+        dispatcher.send(message, args.action, {"number": "5551234567",
+                                               "text": f"message {idx}"})
+    client.done.wait()
+    delivered = perf_counter() - start
+    while dispatcher.stats["acked"] + dispatcher.stats["failed"] + \
+            dispatcher.stats["unconfirmed"] < args.sends + \
+            (0 if args.no_ack else 1):
+        sleep(0.05)
+    settled = perf_counter() - start
+    dispatcher.shutdown()
+
+    print(f"{args.sends} {args.action} requests delivered in "
+          f"{delivered:.2f}s ({args.sends / delivered:,.0f}/s), "
+          f"settled in {settled:.2f}s")
+    print(f"duplicate deliveries: {client.duplicates}")
+    print(f"dispatcher stats: {dispatcher.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+from neon_utils.skills.common_message_skill import CMSMatchLevel
+
+from .addresses import normalize_spoken_email
+from .matcher import MessageMatcher
+from .phrases import ExtractionPhrases
+
+
+class PhraseOccurrences:
+    """
+    Start indices of each of a list of phrases in a growing token list
+    """
+    __slots__ = ("phrases", "_starts")
+
+    def __init__(self, phrases: Tuple[Tuple[str, ...], ...]):
+        self.phrases = phrases
+        self._starts = [[] for _ in phrases]
+
+    def update(self, tokens: List[str], common: int):
+        """
+        Update occurrences after the tokens following `common` changed
+        @param tokens: current tokens
+        @param common: number of leading tokens unchanged since last update
+        """
+        for phrase, starts in zip(self.phrases, self._starts):
+            size = len(phrase)
+            while starts and starts[-1] + size > common:
+                starts.pop()
+            for idx in range(max(0, common - size + 1),
+                             len(tokens) - size + 1):
+                if tokens[idx] == phrase[0] and \
+                        tuple(tokens[idx:idx + size]) == phrase:
+                    starts.append(idx)
+
+    def find(self, start: int, end: int,
+             trailing: bool = False) -> Optional[Tuple[int, int]]:
+        """
+        Find the first occurrence of the highest priority phrase within
+        tokens[start:end], with the semantics of `ExtractionPhrases.find`
+        @return: (start, end) indices relative to `start`, else None
+        """
+        for phrase, starts in zip(self.phrases, self._starts):
+            idx = bisect_left(starts, start)
+            if idx < len(starts):
+                found = starts[idx]
+                if found + len(phrase) + (1 if trailing else 0) <= end:
+                    return found - start, found - start + len(phrase)
+        return None
+
+
+class UtteranceParse:
+    """
+    Parse state of a possibly partial utterance. Each update only scans
+    the tokens that changed since the previous update, so a transcript
+    that grows one word at a time is parsed incrementally and the final
+    transcript is matched without re-scanning its prefix.
+    """
+    def __init__(self, phrases: ExtractionPhrases,
+                 kind_matcher: Optional[MessageMatcher] = None):
+        """
+        @param phrases: extraction phrases for the utterance language
+        @param kind_matcher: message kind matcher, if `kind` is needed
+        """
+        self.phrases = phrases
+        self.kind_matcher = kind_matcher
+        self.tokens = []
+        # Number of tokens reused from previous updates
+        self.reused = 0
+        self._to = PhraseOccurrences(phrases.to)
+        self._message = PhraseOccurrences(phrases.message)
+        self._subject = PhraseOccurrences(phrases.subject)
+        self._with = PhraseOccurrences(phrases.with_)
+        # (index after the last token of a match, kind)
+        self._kinds = []
+        # Results for the current tokens, computed on first access
+        self._sms = None
+        self._email = None
+
+    def update(self, utt: str):
+        """
+        Update the parse with the current transcript
+        @param utt: full transcript so far
+        @return: this UtteranceParse
+        """
+        tokens = utt.split()
+        common = 0
+        limit = min(len(tokens), len(self.tokens))
+        while common < limit and tokens[common] == self.tokens[common]:
+            common += 1
+        self.reused += common
+        if common == len(tokens) == len(self.tokens):
+            # Unchanged, i.e. a final transcript equal to the last partial
+            return self
+        self._sms = self._email = None
+        for occurrences in (self._to, self._message, self._subject,
+                            self._with):
+            occurrences.update(tokens, common)
+        if self.kind_matcher:
+            self._update_kinds(tokens, common)
+        self.tokens = tokens
+        return self
+
+    @property
+    def kind(self) -> Optional[str]:
+        """
+        Highest priority message kind referenced in the utterance
+        """
+        if not self._kinds:
+            return None
+        return min((kind for _, kind in self._kinds),
+                   key=self.kind_matcher.priority)
+
+    def sms(self) -> Tuple[Optional[str], Optional[str],
+                           Optional[CMSMatchLevel]]:
+        """
+        Parse SMS recipient and message, optionally returning either or both
+        @return: (String?, String?, CMSMatchLevel?) recipient, message, conf
+        """
+        if self._sms is None:
+            tokens = self.tokens
+            found = self._to.find(0, len(tokens))
+            if not found or found[1] >= len(tokens):
+                self._sms = None, None, None
+            else:
+                message = self._message.find(found[1] + 1, len(tokens),
+                                             trailing=True)
+                self._sms = split_sms(tokens, found[1], message)
+        return self._sms
+
+    def email(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Parse email recipient and subject, optionally returning either or both
+        @return: (String?, String?) recipient, subject
+        """
+        if self._email is None:
+            tokens = self.tokens
+            found = self._to.find(0, len(tokens))
+            if not found:
+                self._email = None, None
+            else:
+                subject = self._subject.find(found[1], len(tokens))
+                with_ = subject and self._with.find(found[1],
+                                                    found[1] + subject[0])
+                self._email = split_email(tokens, found[1], subject, with_,
+                                          self.phrases)
+        return self._email
+
+    def _update_kinds(self, tokens: List[str], common: int):
+        while self._kinds and self._kinds[-1][0] > common:
+            self._kinds.pop()
+        # Re-scan enough unchanged tokens to catch phrases that end in
+        # changed tokens
+        start = max(0, common - self.kind_matcher.max_words + 1)
+        if start >= len(tokens):
+            return
+        window = tokens[start:]
+        ends = []
+        position = -1
+        for token in window:
+            position += len(token) + 1
+            ends.append(position)
+        for end, kind in self.kind_matcher.scan(" ".join(window)):
+            end = start + bisect_left(ends, end) + 1
+            if end > common:
+                self._kinds.append((end, kind))
+
+
+def extract_sms(tokens: List[str], to: Optional[Tuple[int, int]],
+                phrases: ExtractionPhrases) -> \
+        Tuple[Optional[str], Optional[str], Optional[CMSMatchLevel]]:
+    """
+    Parse SMS recipient and message from utterance tokens
+    @param tokens: utterance tokens
+    @param to: span of the phrase preceding the recipient, if found
+    @param phrases: extraction phrases for the utterance language
+    @return: (String?, String?, CMSMatchLevel?) recipient, message, conf
+    """
+    if not to or to[1] >= len(tokens):
+        return None, None, None
+    message = phrases.find(tokens[to[1] + 1:], phrases.message,
+                           trailing=True)
+    return split_sms(tokens, to[1], message)
+
+
+def extract_email(tokens: List[str], to: Optional[Tuple[int, int]],
+                  phrases: ExtractionPhrases) -> \
+        Tuple[Optional[str], Optional[str]]:
+    """
+    Parse email recipient and subject from utterance tokens
+    @param tokens: utterance tokens
+    @param to: span of the phrase preceding the recipient, if found
+    @param phrases: extraction phrases for the utterance language
+    @return: (String?, String?) recipient, subject
+    """
+    if not to:
+        return None, None
+    remainder = tokens[to[1]:]
+    subject = phrases.find(remainder, phrases.subject)
+    with_ = subject and phrases.find(remainder[:subject[0]], phrases.with_)
+    return split_email(tokens, to[1], subject, with_, phrases)
+
+
+def split_sms(tokens: List[str], to_end: int,
+              message: Optional[Tuple[int, int]]) -> \
+        Tuple[str, Optional[str], CMSMatchLevel]:
+    """
+    Split SMS tokens into recipient and message
+    @param tokens: utterance tokens
+    @param to_end: index after the phrase preceding the recipient
+    @param message: span of the phrase preceding the message, relative to
+        the token after the first recipient token
+    @return: (String, String?, CMSMatchLevel) recipient, message, conf
+    """
+    recipient = tokens[to_end]
+    remainder = tokens[to_end + 1:]
+    if message:
+        recipient = " ".join([recipient] + remainder[:message[0]])
+        return recipient, " ".join(remainder[message[1]:]), \
+            CMSMatchLevel.MEDIA
+    if len(" ".join(remainder)) <= 1:
+        return " ".join([recipient] + remainder), None, CMSMatchLevel.MEDIA
+    return recipient, " ".join(remainder), CMSMatchLevel.LOOSE
+
+
+def split_email(tokens: List[str], to_end: int,
+                subject: Optional[Tuple[int, int]],
+                with_: Optional[Tuple[int, int]],
+                phrases: ExtractionPhrases) -> \
+        Tuple[Optional[str], Optional[str]]:
+    """
+    Split email tokens into recipient address and subject
+    @param tokens: utterance tokens
+    @param to_end: index after the phrase preceding the recipient
+    @param subject: span of the phrase preceding the subject, relative to
+        `to_end`
+    @param with_: span of a phrase ending the recipient, relative to `to_end`
+    @param phrases: extraction phrases for the utterance language
+    @return: (String?, String?) recipient, subject
+    """
+    remainder = tokens[to_end:]
+    if subject:
+        recipient = remainder[:with_[0] if with_ else subject[0]]
+        subject = " ".join(remainder[subject[1]:])
+    else:
+        recipient = remainder
+
+    # Parse out email words
+    recipient = " ".join(recipient)
+    recipient = normalize_spoken_email(recipient, phrases.at,
+                                       phrases.symbols) or \
+        phrases.join_dots(recipient)
+    return recipient or None, subject
@@ -0,0 +1,73 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import logging
+
+from random import random
+from typing import Callable
+
+from ovos_utils.log import LOG
+
+
+def log_enabled(level: int) -> bool:
+    """
+    Check if messages at the given level will be logged, so log strings are
+    only built when they will be emitted.
+    """
+    log_level = LOG.level
+    if isinstance(log_level, str):
+        log_level = logging.getLevelName(log_level.upper())
+    return not isinstance(log_level, int) or log_level <= level
+
+
+class Tracer:
+    """
+    Emits structured trace events. Event fields are only built when an event
+    is emitted: every event is logged at debug level when debug logging is
+    enabled, otherwise a `sample_rate` fraction of events is logged at info.
+    """
+    def __init__(self, sample_rate: float = 0.0):
+        self.sample_rate = sample_rate
+
+    def trace(self, event: str, fields: Callable[[], dict]):
+        """
+        Emit a trace event
+        @param event: name of the event
+        @param fields: callable returning a dict of event fields
+        """
+        if self.sample_rate and random() < self.sample_rate:
+            log = LOG.info
+        elif log_enabled(logging.DEBUG):
+            log = LOG.debug
+        else:
+            return
+        log(f"trace {event} {json.dumps(fields(), default=repr)}")
+
+
+TRACER = Tracer()